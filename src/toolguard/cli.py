@@ -8,6 +8,9 @@ import markdown
 import logging
 
 from toolguard.core import build_toolguards
+from toolguard.data_types import RESULTS_FILENAME
+from toolguard.gen_py.bundle import BUNDLE_EXTENSION, bundle_toolguards
+from toolguard.llm.cache import LLMCache, LLMCacheMode, set_llm_cache
 from toolguard.llm.tg_litellm import LitellmModel
 
 logger = logging.getLogger(__name__)
@@ -24,8 +27,26 @@ def main():
 	parser.add_argument('--step1-model-name', type=str, default='gpt-4o-2024-08-06', help='Model to use for generating in step 1')
 	parser.add_argument('--tools2run', nargs='+', default=None, help='Optional list of tool names. These are a subset of the tools in the openAPI operation ids.')
 	parser.add_argument('--short-step1', action='store_true', default=False, help='run short version of step 1')
+	parser.add_argument('--resume', action='store_true', default=False, help='Resume step 1 of a previous run into the same output folder. Stages with a checkpoint from the same inputs are skipped')
+	parser.add_argument('--llm-cache', type=str, default=None, help='Path to an on-disk cache (SQLite) of LLM responses, shared by step 1 and step 2. eg: `~/.cache/toolguard/llm.db`')
+	parser.add_argument('--llm-cache-mode', type=LLMCacheMode, choices=list(LLMCacheMode), default=LLMCacheMode.read_write, help='`replay` only reads the cache, and fails on a missing response')
+	parser.add_argument('--llm-cache-max-mb', type=float, default=512, help='Size of the LLM cache, above which the least recently used responses are evicted')
+
+	subparsers = parser.add_subparsers(dest='command')
+	bundle_parser = subparsers.add_parser('bundle', help='Pack a step2 output folder into a single bundle file, loadable by `load_toolguards`')
+	bundle_parser.add_argument('--step2-dir', type=str, required=True, help='Path to the step2 output folder')
+	bundle_parser.add_argument('--out-file', type=str, default=None, help=f'Path of the bundle file. Defaults to `<step2-dir>{BUNDLE_EXTENSION}`')
+	bundle_parser.add_argument('--results-file', type=str, default=RESULTS_FILENAME, help='Name of the results file in the step2 folder')
 	
 	args = parser.parse_args()
+	if args.command == 'bundle':
+		out_file = args.out_file or os.path.normpath(args.step2_dir) + BUNDLE_EXTENSION
+		bundle_toolguards(args.step2_dir, out_file, args.results_file)
+		return
+
+	if args.llm_cache and args.llm_cache_mode != LLMCacheMode.off:
+		set_llm_cache(LLMCache(os.path.expanduser(args.llm_cache), args.llm_cache_mode, args.llm_cache_max_mb))
+
 	policy_path = args.policy_path
 	
 	policy_text = open(policy_path, 'r', encoding='utf-8').read()
@@ -40,7 +61,8 @@ def main():
 			out_dir = args.out_dir,
 			step1_llm = llm,
 			tools2run = args.tools2run,
-			short1 = args.short_step1
+			short1 = args.short_step1,
+			resume = args.resume
 		)
 	)
 
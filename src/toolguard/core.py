@@ -14,13 +14,13 @@ from toolguard.stages_tptd.text_tool_policy_generator import ToolInfo, step1_mai
 
 logger = logging.getLogger(__name__)
 
-async def build_toolguards(policy_text:str, tools: List[Callable], out_dir:str, step1_llm:TG_LLM, app_name:str="my_app", tools2run:List[str]|None=None, short1=False):
+async def build_toolguards(policy_text:str, tools: List[Callable], out_dir:str, step1_llm:TG_LLM, app_name:str="my_app", tools2run:List[str]|None=None, short1=False, resume=False):
 	os.makedirs(out_dir, exist_ok=True)
 	step1_out_dir = join(out_dir, "step1")
 	step2_out_dir = join(out_dir, "step2")
 
 	tools_info = functions_to_tool_info(tools)
-	await step1_main(policy_text, tools_info, step1_out_dir,step1_llm, tools2run, short1)
+	await step1_main(policy_text, tools_info, step1_out_dir,step1_llm, tools2run, short1, resume)
 	result = await generate_guards_from_tool_policies(tools, step1_out_dir, step2_out_dir, app_name, tools2run)
 	return result
 
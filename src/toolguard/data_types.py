@@ -1,12 +1,18 @@
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, wait as futures_wait
+import contextvars
+from enum import StrEnum
 import os
 from pathlib import Path
+import threading
+import time
 from pydantic import BaseModel, Field
-from typing import Any, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Union
 
 DEBUG_DIR = "debug"
 TESTS_DIR = "tests"
 RESULTS_FILENAME = "result.json"
+RUNTIME_MANIFEST_FILENAME = "runtime.json"
 API_PARAM = "api"
 
 class FileTwin(BaseModel):
@@ -86,3 +92,94 @@ class PolicyViolationException(Exception):
     @property
     def message(self):
         return self._msg
+
+class PolicyViolationsException(PolicyViolationException):
+    """Several policy items of the same tool call were violated. Violations are listed in policy items order."""
+    violations: List[PolicyViolationException]
+    def __init__(self, violations: List[PolicyViolationException]):
+        super().__init__("\n".join([v.message for v in violations]))
+        self.violations = violations
+
+class GuardTimeoutException(PolicyViolationException):
+    """The guard of a tool call did not complete within its time budget, and the runtime fails closed."""
+    tool_name: str
+    budget: float
+    def __init__(self, tool_name: str, budget: float, message: Optional[str] = None):
+        super().__init__(message or f"The guard of tool '{tool_name}' exceeded its time budget of {budget}s")
+        self.tool_name = tool_name
+        self.budget = budget
+
+class ItemGuardsExecution(StrEnum):
+    sequential = "sequential" # one item after the other. Stops at the first violation
+    concurrent_first = "concurrent_first" # concurrently. Reports the first violation, in items order
+    concurrent_all = "concurrent_all" # concurrently. Reports all the violations, in items order. See `run_item_guards`
+
+item_guards_execution: contextvars.ContextVar[ItemGuardsExecution] = contextvars.ContextVar("item_guards_execution", default=ItemGuardsExecution.sequential)
+# Called with the name and duration (in seconds) of every item guard run. Set by the runtime when it collects metrics.
+item_guards_observer: contextvars.ContextVar[Optional[Callable[[str, float], None]]] = contextvars.ContextVar("item_guards_observer", default=None)
+
+_item_guards_pool: Optional[ThreadPoolExecutor] = None
+_item_guards_pool_lock = threading.Lock()
+def _get_item_guards_pool()->ThreadPoolExecutor:
+    global _item_guards_pool
+    with _item_guards_pool_lock:
+        if _item_guards_pool is None:
+            _item_guards_pool = ThreadPoolExecutor(thread_name_prefix="toolguard-items")
+        return _item_guards_pool
+
+def _reset_item_guards_pool():
+    # The worker threads of the parent process do not exist in a forked child
+    global _item_guards_pool, _item_guards_pool_lock
+    _item_guards_pool = None
+    _item_guards_pool_lock = threading.Lock()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_item_guards_pool)
+
+def run_item_guards(item_guards: Union[List[Callable[[], Any]], Dict[str, Callable[[], Any]]]):
+    """
+    Runs the policy item guards of a tool, according to the current `item_guards_execution` mode.
+    `item_guards` maps the item guard function names to their calls. A plain list of calls is accepted too.
+
+    In the concurrent modes, all the item guards complete, and their outcomes are reported in items order, as in sequential mode.
+    The first failing item decides: if it raised an error other than a policy violation, that error is raised.
+    Otherwise, `concurrent_first` raises its violation, and `concurrent_all` raises it together with the violations 
+    of the later items (as a `PolicyViolationsException`), ignoring the errors of later items.
+    """
+    if isinstance(item_guards, dict):
+        observer = item_guards_observer.get()
+        item_guards = [_timed(name, item_guard, observer) if observer else item_guard for name, item_guard in item_guards.items()]
+    mode = item_guards_execution.get()
+    if mode == ItemGuardsExecution.sequential or len(item_guards) < 2:
+        for item_guard in item_guards:
+            item_guard()
+        return
+
+    pool = _get_item_guards_pool()
+    futures = [pool.submit(contextvars.copy_context().run, item_guard) for item_guard in item_guards]
+    futures_wait(futures)
+    violations = []
+    for future in futures:
+        ex = future.exception()
+        if ex is None:
+            continue
+        if not isinstance(ex, PolicyViolationException):
+            if violations: # an earlier item violated the policy
+                continue
+            raise ex
+        if mode == ItemGuardsExecution.concurrent_first:
+            raise ex
+        violations.append(ex)
+    if len(violations) == 1:
+        raise violations[0]
+    if violations:
+        raise PolicyViolationsException(violations)
+
+def _timed(name: str, item_guard: Callable[[], Any], observer: Callable[[str, float], None])->Callable[[], Any]:
+    def run():
+        start = time.perf_counter()
+        try:
+            return item_guard()
+        finally:
+            observer(name, time.perf_counter() - start)
+    return run
@@ -184,10 +184,14 @@ class APIExtractor:
     def _generate_delegate_code(self, func:Callable)->List[str]:
         func_name = _get_type_name(func)
         indent = " "*4*2
-        T = "bla" #FIXME
+        try:
+            ret_type = get_type_hints(func).get('return')
+        except:
+            ret_type = None
+        model = self._format_type(ret_type) if ret_type not in (None, type(None)) else "Any"
         return [
             indent+"args = {k: v for k, v in locals().items() if k != 'self'}",
-            indent+f"return self._delegate.invoke('{func_name}', args, T)"
+            indent+f"return self._delegate.invoke('{func_name}', args, {model})"
         ]
     
     def _get_function_with_docstring(self, func:FunctionType, func_name:str)->List[str]:
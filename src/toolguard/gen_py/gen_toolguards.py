@@ -11,11 +11,13 @@ from toolguard.gen_py.domain_from_funcs import generate_domain_from_functions
 from toolguard.data_types import RuntimeDomain, ToolPolicy
 from toolguard.gen_py.domain_from_openapi import generate_domain_from_openapi
 from toolguard.runtime import ToolGuardsCodeGenerationResult
+from toolguard.gen_py.scheduler import GenerationScheduler
+from toolguard.llm.cache import start_llm_cache_run
 from toolguard.gen_py.tool_guard_generator import ToolGuardGenerator
 import toolguard.utils.pytest as pytest
 import toolguard.utils.venv as venv
 import toolguard.utils.pyright as pyright
-from toolguard.common.py import unwrap_fn
+from toolguard.common.py import path_to_module, unwrap_fn
 
 logger = logging.getLogger(__name__)
 
@@ -39,7 +41,15 @@ async def generate_toolguards_from_openapi(app_name: str, tool_policies: List[To
     domain = generate_domain_from_openapi(py_root, app_name, openapi_file)
     return await generate_toolguards_from_domain(app_name, tool_policies, py_root, domain)
 
-async def generate_toolguards_from_domain(app_name: str, tool_policies: List[ToolPolicy], py_root:str, domain: RuntimeDomain)->ToolGuardsCodeGenerationResult:
+async def generate_toolguards_from_domain(app_name: str, tool_policies: List[ToolPolicy], py_root:str, domain: RuntimeDomain, scheduler: Optional[GenerationScheduler] = None)->ToolGuardsCodeGenerationResult:
+    """
+    Generates the guards of all the tools, concurrently.
+    `scheduler` bounds the concurrent LLM calls, pyright and pytest runs. Defaults to the limits in the environment variables (see `GenerationScheduler.from_env`).
+    """
+    if scheduler is None:
+        with GenerationScheduler.from_env() as scheduler:
+            return await generate_toolguards_from_domain(app_name, tool_policies, py_root, domain, scheduler)
+    cache = start_llm_cache_run()
     #Setup env
     venv.run(join(py_root, PY_ENV), PY_PACKAGES)
     pyright.config(py_root)
@@ -48,7 +58,9 @@ async def generate_toolguards_from_domain(app_name: str, tool_policies: List[Too
     genai_backend = cast(Literal["ollama", "hf", "openai", "watsonx", "litellm"], os.getenv("TOOLGUARD_STEP2_GENAI_BACKEND", "openai"))
     genai_model = os.getenv("TOOLGUARD_STEP2_GENAI_MODEL")
     assert genai_model, "'TOOLGUARD_STEP2_GENAI_MODEL' environment variable not set"
-    with mellea.start_session(
+    # The domain and the runtime do not change while generating. Tests import them once, in the pre-warmed pytest process
+    preload = [RUNTIME_PACKAGE_NAME, path_to_module(domain.app_types.file_name), path_to_module(domain.app_api.file_name)]
+    with pyright.server(py_root, PY_ENV), pytest.workers(py_root, preload), mellea.start_session(
         backend_name= genai_backend,
         model_id=genai_model,
         base_url=os.getenv("OPENAI_API_BASE"),
@@ -57,10 +69,13 @@ async def generate_toolguards_from_domain(app_name: str, tool_policies: List[Too
         #tools
         tools_w_poilicies = [tool_policy for tool_policy in tool_policies if len(tool_policy.policy_items) > 0]
         tool_results = await asyncio.gather(*[
-            ToolGuardGenerator(app_name, tool_policy, py_root, domain, PY_ENV)\
+            ToolGuardGenerator(app_name, tool_policy, py_root, domain, PY_ENV, scheduler)\
                 .generate()
             for tool_policy in tools_w_poilicies
         ])
+    scheduler.log_stats()
+    if cache:
+        cache.log_stats()
 
     tools_result = {tool.tool_name: res 
         for tool, res 
@@ -2,9 +2,11 @@
 from typing import List, Set
 from toolguard.data_types import Domain, FileTwin, ToolPolicyItem
 from mellea import generative
+from toolguard.llm.cache import cached_generative
 
 # from toolguard.gen_py.prompts.python_code import PythonCodeModel
 
+@cached_generative
 @generative
 def generate_init_tests(
     fn_src: FileTwin, 
@@ -106,6 +108,7 @@ def test_violation_book_room_in_the_past():
     ...
 
 
+@cached_generative
 @generative
 def improve_tests(
     prev_impl: str, 
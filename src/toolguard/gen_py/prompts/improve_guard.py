@@ -2,9 +2,11 @@
 from typing import List, Set
 from toolguard.data_types import Domain, ToolPolicyItem
 from mellea import generative
+from toolguard.llm.cache import cached_generative
 
 # from toolguard.gen_py.prompts.python_code import PythonCodeModel
 
+@cached_generative
 @generative
 def improve_tool_guard(prev_impl: str, domain: Domain, policy_item: ToolPolicyItem, dependent_tool_names: List[str], review_comments: List[str])-> str:
     """
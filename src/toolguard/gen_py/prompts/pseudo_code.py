@@ -1,7 +1,9 @@
 from toolguard.data_types import Domain, ToolPolicyItem
 from mellea import generative
+from toolguard.llm.cache import cached_generative
 
 
+@cached_generative
 @generative
 def tool_policy_pseudo_code(policy_item: ToolPolicyItem, fn_to_analyze: str, domain: Domain) -> str:
     """
@@ -0,0 +1,91 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+from enum import StrEnum
+import logging
+import os
+import time
+from typing import Callable, Dict, Optional, TypeVar
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+class Stage(StrEnum):
+    llm = "llm"
+    pyright = "pyright"
+    pytest = "pytest"
+
+class StageStats(BaseModel):
+    runs: int = 0
+    queue_wait: float = 0.0 # total, in seconds
+    max_queue_wait: float = 0.0
+    run_time: float = 0.0 # total, in seconds
+
+    @property
+    def mean_queue_wait(self)->float:
+        return self.queue_wait / self.runs if self.runs else 0.0
+
+class GenerationScheduler:
+    """
+    Bounds the number of concurrent LLM calls, pyright runs and pytest runs of the guards code generation.
+    Each stage has its own limit, so slow LLM calls do not hold the CPU bound slots, and vice versa.
+    The blocking calls run in worker threads, so the event loop keeps scheduling the other tools and policy items.
+    Each stage has its own thread pool, sized to its limit, so a call that got its slot starts at once.
+    """
+    def __init__(self, max_llm_calls: int = 8, max_pyright_runs: Optional[int] = None, max_pytest_runs: Optional[int] = None) -> None:
+        cpus = os.cpu_count() or 4
+        self.limits: Dict[Stage, int] = {
+            Stage.llm: max_llm_calls,
+            Stage.pyright: max_pyright_runs or cpus,
+            Stage.pytest: max_pytest_runs or cpus,
+        }
+        self._semaphores = {stage: asyncio.Semaphore(limit) for stage, limit in self.limits.items()}
+        self._executors = {stage: ThreadPoolExecutor(max_workers=limit, thread_name_prefix=f"toolguard-{stage}") for stage, limit in self.limits.items()}
+        self._stats = {stage: StageStats() for stage in Stage}
+
+    @classmethod
+    def from_env(cls)->'GenerationScheduler':
+        """Limits from the `TOOLGUARD_STEP2_MAX_LLM_CALLS`, `TOOLGUARD_STEP2_MAX_PYRIGHT_RUNS` and `TOOLGUARD_STEP2_MAX_PYTEST_RUNS` environment variables."""
+        def env_int(name: str)->Optional[int]:
+            value = os.getenv(name)
+            return int(value) if value else None
+        return cls(
+            max_llm_calls=env_int("TOOLGUARD_STEP2_MAX_LLM_CALLS") or 8,
+            max_pyright_runs=env_int("TOOLGUARD_STEP2_MAX_PYRIGHT_RUNS"),
+            max_pytest_runs=env_int("TOOLGUARD_STEP2_MAX_PYTEST_RUNS")
+        )
+
+    async def run(self, stage: Stage, fn: Callable[[], T])->T:
+        """Runs the blocking `fn` in a worker thread, once a slot of the stage is available."""
+        enqueued = time.perf_counter()
+        async with self._semaphores[stage]:
+            started = time.perf_counter()
+            try:
+                ctx = contextvars.copy_context() # eg: the mellea session
+                return await asyncio.get_running_loop().run_in_executor(self._executors[stage], ctx.run, fn)
+            finally:
+                stats = self._stats[stage]
+                stats.runs += 1
+                stats.queue_wait += started - enqueued
+                stats.max_queue_wait = max(stats.max_queue_wait, started - enqueued)
+                stats.run_time += time.perf_counter() - started
+
+    def shutdown(self):
+        for executor in self._executors.values():
+            executor.shutdown(wait=False)
+
+    def __enter__(self)->'GenerationScheduler':
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+
+    def stats(self)->Dict[Stage, StageStats]:
+        return {stage: stats.model_copy() for stage, stats in self._stats.items()}
+
+    def log_stats(self):
+        for stage, stats in self._stats.items():
+            logger.info(f"{stage}: {stats.runs} runs (limit {self.limits[stage]}), queue wait: total {stats.queue_wait:.1f}s, mean {stats.mean_queue_wait:.2f}s, max {stats.max_queue_wait:.2f}s. run time: {stats.run_time:.1f}s")
@@ -1,14 +1,14 @@
-import asyncio
 import re
 from typing import Set
 from toolguard.data_types import Domain, ToolPolicyItem
+from toolguard.gen_py.scheduler import GenerationScheduler, Stage
 from mellea.backends.types import ModelOption
 from toolguard.gen_py.prompts.pseudo_code import tool_policy_pseudo_code
 
 MAX_TRIALS = 3
-async def tool_dependencies(policy_item: ToolPolicyItem, tool_signature: str, domain:Domain, trial=0) -> Set[str]:
+async def tool_dependencies(policy_item: ToolPolicyItem, tool_signature: str, domain:Domain, scheduler: GenerationScheduler, trial=0) -> Set[str]:
     model_options = {ModelOption.TEMPERATURE: 0.8}
-    pseudo_code = await asyncio.to_thread( #FIXME when melea will support aysnc
+    pseudo_code = await scheduler.run(Stage.llm, #FIXME when melea will support aysnc
         lambda: tool_policy_pseudo_code(
             policy_item=policy_item, 
             fn_to_analyze=tool_signature, 
@@ -21,7 +21,7 @@ async def tool_dependencies(policy_item: ToolPolicyItem, tool_signature: str, do
         return fn_names
     if trial<=MAX_TRIALS:
         # as tool_policy_pseudo_code has some temerature, we retry hoping next time the pseudo code will be correct
-        return await tool_dependencies(policy_item, tool_signature, domain, trial+1)
+        return await tool_dependencies(policy_item, tool_signature, domain, scheduler, trial+1)
     raise Exception("Failed to analyze api dependencies")
 
 
@@ -12,6 +12,7 @@ from toolguard.common.py_doc_str import extract_docstr_args
 from toolguard.common.str import to_snake_case
 from toolguard.data_types import DEBUG_DIR, TESTS_DIR, Domain, FileTwin, RuntimeDomain, ToolPolicy, ToolPolicyItem, ToolPolicyItem
 from toolguard.gen_py.consts import guard_fn_module_name, guard_fn_name, guard_item_fn_module_name, guard_item_fn_name, test_fn_module_name
+from toolguard.gen_py.scheduler import GenerationScheduler, Stage
 from toolguard.gen_py.tool_dependencies import tool_dependencies
 from toolguard.runtime import ToolGuardCodeResult, find_class_in_module, load_module_from_path
 import toolguard.utils.pytest as pytest
@@ -31,13 +32,15 @@ class ToolGuardGenerator:
     tool_policy: ToolPolicy
     domain: RuntimeDomain
     common: FileTwin
+    scheduler: GenerationScheduler
 
-    def __init__(self, app_name: str, tool_policy: ToolPolicy, py_path: str, domain: RuntimeDomain, py_env:str) -> None:
+    def __init__(self, app_name: str, tool_policy: ToolPolicy, py_path: str, domain: RuntimeDomain, py_env:str, scheduler: GenerationScheduler) -> None:
         self.py_path = py_path
         self.app_name = app_name
         self.tool_policy = tool_policy
         self.domain = domain
         self.py_env = py_env
+        self.scheduler = scheduler # owned by the caller, which shuts it down
 
     def start(self):
         app_path = join(self.py_path, to_snake_case(self.app_name))
@@ -76,7 +79,7 @@ class ToolGuardGenerator:
         dep_tools = []
         if self.domain.app_api_size > 1:
             domain = self.domain.get_definitions_only() #remove runtime fields
-            dep_tools = await tool_dependencies(item, sig_str, domain)
+            dep_tools = await tool_dependencies(item, sig_str, domain, self.scheduler)
         logger.debug(f"Dependencies of '{item.name}': {dep_tools}")
 
         # Generate tests
@@ -120,24 +123,26 @@ class ToolGuardGenerator:
             first_time = (trial_no == "a")
             if first_time:
                 #FIXME when melea will support aysnc
-                res = await asyncio.to_thread(
+                res = await self.scheduler.run(Stage.llm,
                     lambda: generate_init_tests(fn_src=guard, policy_item=item, domain=domain, dependent_tool_names=dep_tools)
                 )
             else:
                 assert test_file
+                prev_tests = test_file # narrowed, for the lambda
                 #FIXME when melea will support aysnc
-                res = await asyncio.to_thread(
-                    lambda: improve_tests(prev_impl=test_file.content, domain=domain, policy_item=item, review_comments=errors, dependent_tool_names=dep_tools)
+                res = await self.scheduler.run(Stage.llm,
+                    lambda: improve_tests(prev_impl=prev_tests.content, domain=domain, policy_item=item, review_comments=errors, dependent_tool_names=dep_tools)
                 )
 
-            test_file = FileTwin(
+            tests = FileTwin(
                     file_name= test_file_name,
                     content=get_code_content(res)
                 )\
                 .save(self.py_path)
-            test_file.save_as(self.py_path, self.debug_dir(item, f"test_{trial_no}.py"))
+            test_file = tests
+            tests.save_as(self.py_path, self.debug_dir(item, f"test_{trial_no}.py"))
 
-            syntax_report = pyright.run(self.py_path, test_file.file_name, self.py_env)
+            syntax_report = await self.scheduler.run(Stage.pyright, lambda: pyright.run(self.py_path, tests.file_name, self.py_env))
             FileTwin(
                     file_name= self.debug_dir(item, f"test_{trial_no}_pyright.json"),
                     content=syntax_report.model_dump_json(indent=2)
@@ -151,7 +156,7 @@ class ToolGuardGenerator:
             #syntax ok, try to run it...
             logger.debug(f"Generated Tests for tool '{self.tool_policy.tool_name}' '{item.name}'(trial='{trial_no}')")
             report_file_name = self.debug_dir(item, f"test_{trial_no}_pytest.json")
-            pytest_report = pytest.run(self.py_path, test_file.file_name, report_file_name)
+            pytest_report = await self.scheduler.run(Stage.pytest, lambda: pytest.run(self.py_path, tests.file_name, report_file_name))
             if pytest_report.all_tests_collected_successfully() and pytest_report.non_empty_tests():
                 return test_file
             if not pytest_report.non_empty_tests():  # empty test set
@@ -165,11 +170,12 @@ class ToolGuardGenerator:
         trial_no = 0
         while trial_no < MAX_TOOL_IMPROVEMENTS:
             pytest_report_file = self.debug_dir(item, f"guard_{trial_no}_pytest.json")
-            errors = pytest.run(
+            pytest_report = await self.scheduler.run(Stage.pytest, lambda: pytest.run(
                     self.py_path, 
                     tests.file_name,
                     pytest_report_file
-                ).list_errors()
+                ))
+            errors = pytest_report.list_errors()
             if errors:
                 logger.debug(f"'{item.name}' guard function tests failed. Retrying...")
                 
@@ -193,7 +199,7 @@ class ToolGuardGenerator:
             domain = self.domain.get_definitions_only() #omit runtime fields
             prev_python = get_code_content(prev_guard.content)
             #FIXME when melea will support aysnc
-            res = await asyncio.to_thread(
+            res = await self.scheduler.run(Stage.llm,
                 lambda: improve_tool_guard(prev_impl=prev_python, domain=domain, policy_item=item, dependent_tool_names=dep_tools, review_comments=review_comments + errors)
             )
 
@@ -203,7 +209,7 @@ class ToolGuardGenerator:
                 ).save(self.py_path)
             guard.save_as(self.py_path, self.debug_dir(item, f"guard_{round}_{trial}.py"))
 
-            syntax_report = pyright.run(self.py_path, guard.file_name, self.py_env)
+            syntax_report = await self.scheduler.run(Stage.pyright, lambda: pyright.run(self.py_path, guard.file_name, self.py_env))
             FileTwin(
                     file_name=self.debug_dir(item, f"guard_{round}_{trial}.pyright.json"), 
                     content=syntax_report.model_dump_json(indent=2)
@@ -0,0 +1,214 @@
+import functools
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from enum import StrEnum
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+from pydantic import BaseModel
+
+from toolguard.llm.tg_llm import TG_LLM
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+CACHE_PATH_ENV = "TOOLGUARD_LLM_CACHE"
+CACHE_MODE_ENV = "TOOLGUARD_LLM_CACHE_MODE"
+CACHE_MAX_MB_ENV = "TOOLGUARD_LLM_CACHE_MAX_MB"
+
+class LLMCacheMode(StrEnum):
+	off = "off"
+	read_write = "read_write"
+	replay = "replay" # read only. a cache miss is an error
+
+class LLMCacheMissError(RuntimeError):
+	pass
+
+class LLMCache:
+	"""
+	An on-disk (SQLite) cache of LLM responses, keyed by a hash of the model name, the messages and the options.
+
+	Identical requests are counted: the n-th identical request of a run gets the n-th cached response.
+	So repeated calls, such as several reviews of the same policy, replay their distinct responses.
+	A run (eg: step1, or step2) starts with `new_run()`, so the next runs of the same process replay the same responses.
+	When the database grows over `max_size_mb`, the least recently used responses are evicted.
+	"""
+	def __init__(self, path: str, mode: LLMCacheMode = LLMCacheMode.read_write, max_size_mb: float = 512) -> None:
+		self.path = path
+		self.mode = mode
+		self.max_size = int(max_size_mb * 1024 * 1024)
+		self.hits = 0
+		self.misses = 0
+		self._occurrences: Dict[str, int] = defaultdict(int)
+		self._lock = threading.Lock()
+		os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+		self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+		self._db.execute("PRAGMA journal_mode=WAL")
+		self._db.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)")
+		self._db.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)")
+		self._size = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+	@classmethod
+	def from_env(cls)->Optional['LLMCache']:
+		"""A cache from the `TOOLGUARD_LLM_CACHE` (database path), `TOOLGUARD_LLM_CACHE_MODE` and `TOOLGUARD_LLM_CACHE_MAX_MB` environment variables."""
+		path = os.getenv(CACHE_PATH_ENV)
+		mode = LLMCacheMode(os.getenv(CACHE_MODE_ENV) or LLMCacheMode.read_write)
+		if not path or mode == LLMCacheMode.off:
+			return None
+		return cls(path, mode, float(os.getenv(CACHE_MAX_MB_ENV) or 512))
+
+	def new_run(self):
+		"""Restarts the counting of identical requests."""
+		with self._lock:
+			self._occurrences.clear()
+
+	def request_key(self, request: Dict[str, Any])->str:
+		digest = hashlib.sha256(json.dumps(request, sort_keys=True, default=_to_json).encode("utf-8")).hexdigest()
+		with self._lock:
+			self._occurrences[digest] += 1
+			return f"{digest}:{self._occurrences[digest]}"
+
+	def get(self, key: str)->Optional[Any]:
+		with self._lock:
+			row = self._db.execute("SELECT value FROM responses WHERE key = ?", (key,)).fetchone()
+			if row is None:
+				self.misses += 1
+				return None
+			self.hits += 1
+			if self.mode == LLMCacheMode.read_write:
+				self._db.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+		return json.loads(row[0])
+
+	def put(self, key: str, value: Any):
+		if self.mode != LLMCacheMode.read_write:
+			return
+		data = json.dumps(value, default=_to_json)
+		with self._lock:
+			old = self._db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+			self._db.execute("INSERT OR REPLACE INTO responses (key, value, size, last_access) VALUES (?, ?, ?, ?)", (key, data, len(data), time.time()))
+			self._size += len(data) - (old[0] if old else 0)
+			if self._size > self.max_size:
+				self._evict(int(self.max_size * 0.9))
+
+	def _evict(self, target_size: int):
+		evicted = 0
+		for key, size in self._db.execute("SELECT key, size FROM responses ORDER BY last_access").fetchall():
+			if self._size <= target_size:
+				break
+			self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+			self._size -= size
+			evicted += 1
+		logger.info(f"LLM cache: evicted {evicted} responses")
+
+	def _lookup(self, request: Dict[str, Any])->tuple:
+		key = self.request_key(request)
+		value = self.get(key)
+		if value is None and self.mode == LLMCacheMode.replay:
+			raise LLMCacheMissError(f"LLM response is not cached (replay mode), in {self.path}")
+		return key, value
+
+	async def acall(self, request: Dict[str, Any], fn: Callable[[], Awaitable[T]])->T:
+		"""Returns the cached response of the request, or awaits `fn` and caches its response."""
+		key, value = self._lookup(request)
+		if value is not None:
+			return value
+		value = await fn()
+		self.put(key, value)
+		return value
+
+	def call(self, request: Dict[str, Any], fn: Callable[[], T])->T:
+		"""Returns the cached response of the request, or calls `fn` and caches its response."""
+		key, value = self._lookup(request)
+		if value is not None:
+			return value
+		value = fn()
+		self.put(key, value)
+		return value
+
+	def log_stats(self):
+		logger.info(f"LLM cache {self.path}: {self.hits} hits, {self.misses} misses, {self._size / 1024 / 1024:.1f}MB")
+
+	def close(self):
+		with self._lock:
+			self._db.close()
+
+def _to_json(obj: Any):
+	if isinstance(obj, BaseModel):
+		return obj.model_dump(mode="json")
+	if isinstance(obj, (set, frozenset)):
+		return sorted(obj, key=str)
+	return str(obj)
+
+_llm_cache: Optional[LLMCache] = None
+_llm_cache_loaded = False
+
+def llm_cache()->Optional[LLMCache]:
+	"""The process LLM cache. Configured by `set_llm_cache`, or from the environment variables."""
+	global _llm_cache, _llm_cache_loaded
+	if not _llm_cache_loaded:
+		_llm_cache = LLMCache.from_env()
+		_llm_cache_loaded = True
+	return _llm_cache
+
+def start_llm_cache_run()->Optional[LLMCache]:
+	"""Starts a new run of the process LLM cache, if one is configured. See `LLMCache.new_run`."""
+	cache = llm_cache()
+	if cache:
+		cache.new_run()
+	return cache
+
+def set_llm_cache(cache: Optional[LLMCache]):
+	global _llm_cache, _llm_cache_loaded
+	_llm_cache = cache
+	_llm_cache_loaded = True
+
+class CachedLLM(TG_LLM):
+	"""A `TG_LLM` answering from an `LLMCache`, and calling the wrapped LLM on a cache miss."""
+	def __init__(self, llm: TG_LLM, cache: LLMCache):
+		self.llm = llm
+		self.cache = cache
+
+	def _request(self, method: str, messages: List[Dict])->Dict[str, Any]:
+		return {
+			"method": method,
+			"model": getattr(self.llm, "model_name", type(self.llm).__name__),
+			"provider": getattr(self.llm, "provider", None),
+			"messages": messages
+		}
+
+	async def chat_json(self, messages: List[Dict]) -> Dict:
+		return await self.cache.acall(self._request("chat_json", messages), lambda: self.llm.chat_json(messages))
+
+	async def generate(self, messages: List[Dict])->str:
+		return await self.cache.acall(self._request("generate", messages), lambda: self.llm.generate(messages))
+
+def cached_llm(llm: TG_LLM)->TG_LLM:
+	"""Wraps the LLM with the process LLM cache, if one is configured."""
+	cache = llm_cache()
+	if cache is None or isinstance(llm, CachedLLM):
+		return llm
+	return CachedLLM(llm, cache)
+
+def cached_generative(slot: Callable[..., T])->Callable[..., T]:
+	"""Caches the responses of a mellea `@generative` function in the process LLM cache. Keyed by the session model, the function, its arguments and model options."""
+	@functools.wraps(slot)
+	def wrapper(m=None, model_options: Optional[dict] = None, **kwargs)->T:
+		cache = llm_cache()
+		if cache is None:
+			return slot(m, model_options, **kwargs)
+		from mellea.stdlib.session import get_session
+		session = m or get_session()
+		request = {
+			"method": getattr(slot, "__qualname__", str(slot)),
+			"model": str(session.backend.model_id),
+			"model_options": {str(k): v for k, v in {**session.backend.model_options, **(model_options or {})}.items()},
+			"arguments": kwargs
+		}
+		return cache.call(request, lambda: slot(m, model_options, **kwargs))
+	return wrapper
@@ -0,0 +1,93 @@
+import asyncio
+import email.utils
+import os
+import random
+import time
+import weakref
+from typing import Dict, Mapping, Optional, Tuple
+
+MAX_RPM_ENV = "TOOLGUARD_LLM_MAX_RPM"
+
+class TokenBucket:
+	"""
+	A token bucket limiting the rate of LLM requests, shared by all the concurrent callers of a model.
+
+	A rate limit error pauses all the callers until its `Retry-After` time, and halves the rate.
+	Successful requests restore the rate gradually, up to `max_rate`.
+	"""
+	def __init__(self, max_rate: float, capacity: Optional[float] = None, min_rate: float = 0.1) -> None:
+		self.max_rate = max_rate # requests per second
+		self.min_rate = min(min_rate, max_rate)
+		self.rate = max_rate
+		self.capacity = capacity or max(1.0, max_rate)
+		self._tokens = self.capacity
+		self._updated = time.monotonic()
+		self._paused_until = 0.0
+		self._lock = asyncio.Lock()
+
+	def _refill(self, now: float):
+		self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+		self._updated = now
+
+	async def acquire(self):
+		"""Waits for a request token. Callers are served in order, so they do not stampede after a pause."""
+		async with self._lock:
+			while True:
+				now = time.monotonic()
+				if now < self._paused_until:
+					await asyncio.sleep(self._paused_until - now)
+					continue
+				self._refill(now)
+				if self._tokens >= 1:
+					self._tokens -= 1
+					return
+				await asyncio.sleep((1 - self._tokens) / self.rate)
+
+	def rate_limited(self, pause: float):
+		now = time.monotonic()
+		self._refill(now)
+		self._paused_until = max(self._paused_until, now + pause)
+		self._tokens = 0
+		self.rate = max(self.min_rate, self.rate / 2)
+
+	def succeeded(self):
+		self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+# per event loop, as the buckets hold asyncio locks
+_buckets: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[str, str], TokenBucket]]' = weakref.WeakKeyDictionary()
+
+def shared_bucket(provider: str, model_name: str)->TokenBucket:
+	"""The token bucket of a model. Its rate is `TOOLGUARD_LLM_MAX_RPM` requests per minute (default 600)."""
+	buckets = _buckets.setdefault(asyncio.get_running_loop(), {})
+	key = (provider or "", model_name)
+	bucket = buckets.get(key)
+	if bucket is None:
+		bucket = buckets[key] = TokenBucket(float(os.getenv(MAX_RPM_ENV) or 600) / 60)
+	return bucket
+
+def backoff_delay(retries: int, backoff_factor: float, base: float = 1.0, max_delay: float = 60.0)->float:
+	"""Exponential backoff with full jitter."""
+	return random.uniform(0, min(max_delay, base * backoff_factor ** retries))
+
+def retry_after(ex: Exception)->Optional[float]:
+	"""The delay in seconds requested by the `Retry-After` (or `retry-after-ms`) header of a rate limit error, if any."""
+	headers: Optional[Mapping[str, str]] = getattr(ex, "headers", None)
+	if not headers:
+		response = getattr(ex, "response", None)
+		headers = getattr(response, "headers", None)
+	if not headers:
+		return None
+	headers = {k.lower(): v for k, v in headers.items()}
+	try:
+		if "retry-after-ms" in headers:
+			return float(headers["retry-after-ms"]) / 1000
+		value = headers.get("retry-after")
+		if value is None:
+			return None
+		try:
+			return max(0.0, float(value))
+		except ValueError:
+			date = email.utils.parsedate_to_datetime(value)
+			return max(0.0, date.timestamp() - time.time())
+	except (TypeError, ValueError):
+		return None
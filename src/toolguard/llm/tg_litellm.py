@@ -1,9 +1,9 @@
 import asyncio
 import json
 import os
+import logging
 import re
 from typing import List, Dict
-import time
 from litellm import acompletion
 from litellm.types.utils import ModelResponse
 from litellm.exceptions import RateLimitError
@@ -12,7 +12,10 @@ from jsonschema import validate, ValidationError
 
 import dotenv
 
-from toolguard.llm.tg_llm import TG_LLM
+from toolguard.llm.rate_limit import backoff_delay, retry_after, shared_bucket
+from toolguard.llm.tg_llm import TG_LLM, llm_usage
+
+logger = logging.getLogger(__name__)
 
 model_name_to_endpoint_list=[
 #	{"endpoint":"https://ete-litellm.bx.cloud9.ibm.com", "model_name":"claude-3-7-sonnet"},
@@ -95,6 +98,7 @@ class LitellmModel(TG_LLM):
 					'Content-Type': 'application/json'
 				},
 			)
+			self.record_usage(response)
 			return response.choices[0].message.content
 
 		response = await acompletion(
@@ -105,26 +109,48 @@ class LitellmModel(TG_LLM):
 				'Content-Type': 'application/json'
 			},
 		)
+		self.record_usage(response)
 		return response["choices"][0]["message"]["content"]
 
+	def record_usage(self, response):
+		usage = llm_usage.get()
+		response_usage = getattr(response, "usage", None)
+		if usage is None or response_usage is None:
+			return
+		details = getattr(response_usage, "prompt_tokens_details", None)
+		usage.add(
+			getattr(response_usage, "prompt_tokens", 0) or 0,
+			getattr(details, "cached_tokens", 0) or 0,
+			getattr(response_usage, "completion_tokens", 0) or 0
+		)
+
 	
 	async def chat_json(self, messages: List[Dict], max_retries: int = 5, backoff_factor: float = 1.5) -> Dict:
+		"""
+		Retries rate limit errors and responses without JSON, with jittered exponential backoff.
+		Rate limits pause all the concurrent callers of the model, for the `Retry-After` time when the provider sends it.
+		"""
+		bucket = shared_bucket(self.provider, self.model_name)
 		retries = 0
 		while retries < max_retries:
+			await bucket.acquire()
 			try:
 				response = await self.generate(messages)
+				bucket.succeeded()
 				res = self.extract_json_from_string(response)
 				if res is None:
-					wait_time = backoff_factor ** retries
-					print(f"Error: not json format. Retrying in {wait_time:.1f} seconds... (attempt {retries + 1}/{max_retries})")
-					time.sleep(wait_time)
+					wait_time = backoff_delay(retries, backoff_factor)
+					logger.warning(f"Error: not json format. Retrying in {wait_time:.1f} seconds... (attempt {retries + 1}/{max_retries})")
+					await asyncio.sleep(wait_time)
 					retries += 1
 				else:
 					return res
 			except RateLimitError as e:
-				wait_time = backoff_factor ** retries
-				print(f"Rate limit hit. Retrying in {wait_time:.1f} seconds... (attempt {retries + 1}/{max_retries})")
-				time.sleep(wait_time)
+				wait_time = retry_after(e)
+				if wait_time is None:
+					wait_time = backoff_delay(retries, backoff_factor)
+				bucket.rate_limited(wait_time)
+				logger.warning(f"Rate limit hit. Retrying in {wait_time:.1f} seconds... (attempt {retries + 1}/{max_retries})")
 				retries += 1
 			except Exception as e:
 				raise RuntimeError(f"Unexpected error during chat completion: {e}")
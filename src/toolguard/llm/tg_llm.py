@@ -1,5 +1,23 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict
+from contextvars import ContextVar
+from typing import List, Dict, Optional
+
+from pydantic import BaseModel
+
+class LLMUsage(BaseModel):
+	calls: int = 0
+	prompt_tokens: int = 0
+	cached_prompt_tokens: int = 0
+	completion_tokens: int = 0
+
+	def add(self, prompt_tokens: int, cached_prompt_tokens: int, completion_tokens: int):
+		self.calls += 1
+		self.prompt_tokens += prompt_tokens
+		self.cached_prompt_tokens += cached_prompt_tokens
+		self.completion_tokens += completion_tokens
+
+# LLMs report the token usage of their calls to the current context
+llm_usage: ContextVar[Optional[LLMUsage]] = ContextVar("llm_usage", default=None)
 
 
 class TG_LLM(ABC):
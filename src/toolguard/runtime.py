@@ -1,31 +1,139 @@
 
+import asyncio
+import bisect
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, wait as futures_wait
+import contextvars
 import inspect
 import json
 import os
-from types import ModuleType
-from typing import Any, Dict, List, Optional, Type, Callable, TypeVar, Union
-from pydantic import BaseModel
+from collections import OrderedDict, deque
+from enum import StrEnum
+from types import CodeType, ModuleType
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Type, Callable, TypeVar, Union, get_args, get_origin, get_type_hints
+from pydantic import BaseModel, TypeAdapter
+import hashlib
+import importlib
 import importlib.util
-import inspect
-import os
+import sys
+import threading
+import time
+import weakref
+import zipfile
+import zipimport
 
 import functools
-from toolguard.data_types import API_PARAM, RESULTS_FILENAME, FileTwin, RuntimeDomain, ToolPolicy
+import logging
+from toolguard.data_types import API_PARAM, RESULTS_FILENAME, RUNTIME_MANIFEST_FILENAME, FileTwin, GuardTimeoutException, ItemGuardsExecution, PolicyViolationException, RuntimeDomain, ToolPolicy
 
 from abc import ABC, abstractmethod
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
 class IToolInvoker(ABC):
     T = TypeVar("T")
     @abstractmethod
     def invoke(self, toolname: str, arguments: Dict[str, Any], model: Type[T])->T:
         ...
 
+    def is_read_only(self, toolname: str)->bool:
+        """Whether the tool was declared read-only, with the `@read_only_tool` decorator."""
+        return False
+
+class IAsyncToolInvoker(ABC):
+    T = TypeVar("T")
+    @abstractmethod
+    async def invoke(self, toolname: str, arguments: Dict[str, Any], model: Type[T])->T:
+        ...
+
+def canonical_arguments(arguments: Dict[str, Any])->str:
+    """Deterministic string representation of tool call arguments. Suitable as a cache key."""
+    def to_json(obj: Any):
+        if isinstance(obj, BaseModel):
+            return obj.model_dump(mode="json")
+        if isinstance(obj, (set, frozenset)):
+            return sorted(obj, key=repr)
+        return str(obj)
+    return json.dumps(arguments, sort_keys=True, default=to_json)
+
+class MemoizingInvoker(IToolInvoker):
+    """
+    Request-scoped memoization of dependent tool lookups. 
+    Identical `(toolname, arguments)` invocations of the given (read-only) tools reach the delegate once.
+    Invocations of other tools, which may mutate state, are always delegated.
+    """
+    def __init__(self, delegate: IToolInvoker, tools: Set[str]) -> None:
+        self._delegate = delegate
+        self._tools = tools
+        self._memo: Dict[Tuple[str, str], Any] = {}
+        self._lock = threading.Lock()
+        self._key_locks: Dict[Tuple[str, str], threading.Lock] = {}
+
+    def is_read_only(self, toolname: str)->bool:
+        return self._delegate.is_read_only(toolname)
+
+    def invoke(self, toolname: str, arguments: Dict[str, Any], model: Type[T])->T:
+        if toolname not in self._tools:
+            return self._delegate.invoke(toolname, arguments, model)
+        key = (toolname, canonical_arguments(arguments))
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock: # concurrent item guards wait for the first lookup
+            if key not in self._memo:
+                self._memo[key] = self._delegate.invoke(toolname, arguments, model)
+            return self._memo[key]
+
+class AsyncInvokerBridge(IToolInvoker):
+    """
+    Exposes an `IAsyncToolInvoker` to the synchronous generated guard code, running in a worker thread.
+    Each tool invocation is scheduled on the event loop, so the loop is not blocked while the tool does I/O.
+    The worker thread must not belong to the loop default executor, which the tool coroutines may need (eg: `asyncio.to_thread`).
+    """
+    def __init__(self, delegate: IAsyncToolInvoker, loop: asyncio.AbstractEventLoop, timeout: Optional[float] = None) -> None:
+        self._delegate = delegate
+        self._loop = loop
+        self._timeout = timeout
+
+    def invoke(self, toolname: str, arguments: Dict[str, Any], model: Type[T])->T:
+        future = asyncio.run_coroutine_threadsafe(self._delegate.invoke(toolname, arguments, model), self._loop)
+        try:
+            return future.result(self._timeout)
+        except TimeoutError:
+            future.cancel()
+            raise TimeoutError(f"Tool '{toolname}' did not complete within {self._timeout}s")
+
 
-def load_toolguards(directory: str, filename: str = RESULTS_FILENAME) -> "ToolguardRuntime":
-    full_path = os.path.join(directory, filename)
-    with open(full_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    result = ToolGuardsCodeGenerationResult(**data)
-    return ToolguardRuntime(result, directory)
+def load_toolguards(directory: str, filename: str = RESULTS_FILENAME, **runtime_options) -> "ToolguardRuntime":
+    """
+    Loads the guards from a step2 output folder, or from a bundle file created by `toolguard bundle`.
+    `runtime_options` are passed to the `ToolguardRuntime` constructor.
+    """
+    return ToolguardRuntime(read_manifest(directory, filename), directory, **runtime_options)
+
+def read_manifest(directory: str, filename: str = RESULTS_FILENAME)->"RuntimeManifest":
+    """
+    Reads the runtime manifest of a step2 output folder, or of a bundle file.
+    Falls back to the results file when the manifest is missing, or older than the results file.
+    """
+    if is_bundle(directory):
+        # zipimporter shares the zip directory cache with the import system
+        bundle = zipimport.zipimporter(directory)
+        try:
+            return RuntimeManifest.model_validate_json(bundle.get_data(RUNTIME_MANIFEST_FILENAME))
+        except OSError:
+            return RuntimeManifest.from_result(ToolGuardsCodeGenerationResult.model_validate_json(bundle.get_data(filename)))
+
+    manifest_path = os.path.join(directory, RUNTIME_MANIFEST_FILENAME)
+    results_path = os.path.join(directory, filename)
+    if os.path.isfile(manifest_path) and (not os.path.isfile(results_path) or os.path.getmtime(manifest_path) >= os.path.getmtime(results_path)):
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return RuntimeManifest.model_validate_json(f.read())
+    with open(results_path, 'r', encoding='utf-8') as f:
+        return RuntimeManifest.from_result(ToolGuardsCodeGenerationResult.model_validate_json(f.read()))
+
+def is_bundle(path: str)->bool:
+    return os.path.isfile(path) and zipfile.is_zipfile(path)
 
 class ToolGuardCodeResult(BaseModel):
     tool: ToolPolicy
@@ -34,72 +142,790 @@ class ToolGuardCodeResult(BaseModel):
     item_guard_files: List[FileTwin|None]
     test_files: List[FileTwin|None]
 
+DEFAULT_LATENCY_BUCKETS = [0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+
+class IMetricsSink(ABC):
+    """Receives the guards execution times, eg: to export them to Prometheus or OpenTelemetry."""
+    @abstractmethod
+    def observe_latency(self, tool_name: str, item_name: Optional[str], seconds: float):
+        """Duration of a tool guard (`item_name` is None), or of one of its policy item guards."""
+        ...
+
+    def observe_budget_exceeded(self, tool_name: str):
+        """The guard of a tool call did not complete within the time budget."""
+        pass
+
+    def observe_abandoned_checks(self, count: int):
+        """Number of guard checks that exceeded the time budget and are still running, each in its own thread."""
+        pass
+
+class LatencyHistogram(BaseModel):
+    buckets: List[float] # upper bounds, in seconds
+    counts: List[int] # per bucket. The last one counts the values above the last bound
+    count: int = 0
+    sum: float = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    @property
+    def mean(self)->float:
+        return self.sum / self.count if self.count else 0.0
+
+class HistogramMetricsSink(IMetricsSink):
+    """In-memory latency histograms, per tool and per policy item."""
+    def __init__(self, buckets: Optional[List[float]] = None) -> None:
+        self._buckets = sorted(buckets or DEFAULT_LATENCY_BUCKETS)
+        self._histograms: Dict[Tuple[str, Optional[str]], LatencyHistogram] = {}
+        self._budget_exceeded: Dict[str, int] = {}
+        self._abandoned_checks = 0
+        self._lock = threading.Lock()
+        _fork_safe_objects.add(self)
+
+    def _after_fork_in_child(self):
+        self._lock = threading.Lock()
+
+    def observe_latency(self, tool_name: str, item_name: Optional[str], seconds: float):
+        with self._lock:
+            histogram = self._histograms.get((tool_name, item_name))
+            if histogram is None:
+                histogram = self._histograms[(tool_name, item_name)] = LatencyHistogram(buckets=self._buckets, counts=[0] * (len(self._buckets) + 1))
+            histogram.observe(seconds)
+
+    def observe_budget_exceeded(self, tool_name: str):
+        with self._lock:
+            self._budget_exceeded[tool_name] = self._budget_exceeded.get(tool_name, 0) + 1
+
+    def observe_abandoned_checks(self, count: int):
+        self._abandoned_checks = count
+
+    def histograms(self)->Dict[Tuple[str, Optional[str]], LatencyHistogram]:
+        """Histograms by `(tool_name, item_name)`. `item_name` is None for the whole tool guard."""
+        with self._lock:
+            return {key: histogram.model_copy(deep=True) for key, histogram in self._histograms.items()}
+
+    def budget_exceeded(self)->Dict[str, int]:
+        """Number of guard checks that exceeded the time budget, per tool name."""
+        with self._lock:
+            return dict(self._budget_exceeded)
+
+    @property
+    def abandoned_checks(self)->int:
+        """Number of guard checks that exceeded the time budget and are still running."""
+        return self._abandoned_checks
+
+class BudgetExceededPolicy(StrEnum):
+    fail_open = "fail_open" # the tool call is allowed, and a warning is logged
+    fail_closed = "fail_closed" # the tool call is rejected with a `GuardTimeoutException`
+
+class ToolCallOutcome(StrEnum):
+    passed = "passed"
+    violation = "violation"
+    error = "error"
+
+class ToolCallCheckResult(BaseModel):
+    index: int
+    tool_name: str
+    outcome: ToolCallOutcome
+    message: Optional[str] = None
+
 class ToolGuardsCodeGenerationResult(BaseModel):
     domain: RuntimeDomain
     tools: Dict[str, ToolGuardCodeResult]
 
     def save(self, directory: str, filename: str = RESULTS_FILENAME) -> 'ToolGuardsCodeGenerationResult':
+        """Saves the results file, and the runtime manifest next to it."""
         full_path = os.path.join(directory, filename)
         with open(full_path, 'w', encoding='utf-8') as f:
             json.dump(self.model_dump(), f, indent=2)
+        RuntimeManifest.from_result(self).save(directory)
         return self
 
-class ToolguardRuntime:
+class ToolGuardManifest(BaseModel):
+    guard_fn_name: str
+    guard_file: str
+    item_guard_files: List[str]
 
-    def __init__(self, result: ToolGuardsCodeGenerationResult, ctx_dir: str) -> None:
-        self._ctx_dir = ctx_dir
-        self._result = result
-        self._guards = {}
-        for tool_name, tool_result in result.tools.items():
-            module = load_module_from_path(tool_result.guard_file.file_name, ctx_dir)
-            guard_fn =find_function_in_module(module, tool_result.guard_fn_name)
-            assert guard_fn, "Guard not found"
-            self._guards[tool_name] = guard_fn
-
-    def _make_args(self, guard_fn:Callable, args: dict,  delegate: IToolInvoker)->Dict[str, Any]:
-        sig = inspect.signature(guard_fn)
-        guard_args = {}
-        for p_name, param in sig.parameters.items():
+class RuntimeManifest(BaseModel):
+    """
+    What the runtime needs to load the guards: file paths and function names, without the files content.
+    Its size depends on the number of tools, but not on the size of the generated code.
+    """
+    app_api_impl_file: str
+    app_api_impl_class_name: str
+    tools: Dict[str, ToolGuardManifest]
+
+    @classmethod
+    def from_result(cls, result: ToolGuardsCodeGenerationResult)->'RuntimeManifest':
+        return cls(
+            app_api_impl_file=result.domain.app_api_impl.file_name,
+            app_api_impl_class_name=result.domain.app_api_impl_class_name,
+            tools={
+                tool_name: ToolGuardManifest(
+                    guard_fn_name=tool.guard_fn_name,
+                    guard_file=tool.guard_file.file_name,
+                    item_guard_files=[item.file_name for item in tool.item_guard_files if item]
+                )
+                for tool_name, tool in result.tools.items()
+            }
+        )
+
+    def save(self, directory: str, filename: str = RUNTIME_MANIFEST_FILENAME) -> 'RuntimeManifest':
+        with open(os.path.join(directory, filename), 'w', encoding='utf-8') as f:
+            f.write(self.model_dump_json(indent=2))
+        return self
+
+class ParamBinder:
+    """Converts the tool call value of a guard parameter into its declared type.
+
+    Validation uses a `TypeAdapter`, built once per parameter, so nested values (eg: `List[Passenger]`) are converted too.
+    Values that already have the declared type (eg: model instances, or lists of them) are passed as is.
+    Instances of other classes with the same fields (eg: the app's own pydantic models) are converted from their attributes.
+    """
+    name: str
+    annotation: Any
+    adapter: Optional[TypeAdapter]
+    item_model: Optional[Type[BaseModel]]
+    default: Any
+
+    def __init__(self, name: str, annotation: Any, default: Any = None) -> None:
+        self.name = name
+        self.annotation = annotation
+        self.default = default
+        args = get_args(annotation)
+        self.item_model = args[0] if get_origin(annotation) in (list, List) and args and _is_model(args[0]) else None
+        self.adapter = None if annotation in (inspect.Parameter.empty, Any) else TypeAdapter(annotation)
+
+    def is_bound(self, value: Any)->bool:
+        if type(value) is self.annotation: # models and plain scalars (str, int, ...)
+            return True
+        if self.item_model:
+            return isinstance(value, list) and all([type(item) is self.item_model for item in value])
+        return False
+
+    def bind(self, args: dict)->Any:
+        if self.name not in args:
+            return self.default
+        value = args[self.name]
+        if value is None or self.adapter is None or self.is_bound(value):
+            return value
+        # from attributes, as the app passes its own model classes, which the generated domain types copy
+        return self.adapter.validate_python(value, from_attributes=True)
+
+def _is_model(annotation: Any)->bool:
+    return inspect.isclass(annotation) and issubclass(annotation, BaseModel)
+
+class ToolCallPlan:
+    """Invocation plan of a tool guard, compiled once from the guard function signature.
+
+    Holds a binder per parameter, and whether the guard expects the `api` parameter, so binding a tool call needs no reflection.
+    """
+    guard_fn: Callable
+    params: List[ParamBinder]
+    api_slot: Optional[int]
+    items_execution_var: Optional[contextvars.ContextVar]
+    items_observer_var: Optional[contextvars.ContextVar]
+
+    def __init__(self, guard_fn: Callable) -> None:
+        self.guard_fn = guard_fn
+        self.params = []
+        self.api_slot = None
+        # The execution mode variable of the data types module the guard is bound to (eg: `rt_toolguard.data_types`)
+        # None for guards generated before item guards runner was introduced
+        runner = guard_fn.__globals__.get("run_item_guards")
+        runner_module = sys.modules.get(runner.__module__) if runner else None
+        self.items_execution_var = getattr(runner_module, "item_guards_execution", None)
+        self.items_observer_var = getattr(runner_module, "item_guards_observer", None)
+        try:
+            hints = get_type_hints(guard_fn)
+        except Exception:
+            hints = {}
+        for i, (p_name, param) in enumerate(inspect.signature(guard_fn).parameters.items()):
             if p_name == API_PARAM:
-                module = load_module_from_path(self._result.domain.app_api_impl.file_name, self._ctx_dir)
-                clazz = find_class_in_module(module, self._result.domain.app_api_impl_class_name)
-                assert clazz, f"class {self._result.domain.app_api_impl_class_name} not found in {self._result.domain.app_api_impl.file_name}"
-                guard_args[p_name] = clazz(delegate)
-            else:
-                arg = args.get(p_name)
-                if inspect.isclass(param.annotation) and issubclass(param.annotation, BaseModel):
-                    guard_args[p_name] = param.annotation.model_construct(arg)
-                else:
-                    guard_args[p_name] = arg
+                self.api_slot = i
+                continue
+            default = None if param.default is inspect.Parameter.empty else param.default
+            self.params.append(ParamBinder(p_name, hints.get(p_name, param.annotation), default))
+
+    def make_args(self, args: dict, api: Any = None)->Dict[str, Any]:
+        """
+        Binds the tool call arguments to the guard parameters.
+
+        Raises:
+            pydantic.ValidationError: If an argument does not match the parameter type.
+        """
+        guard_args = {binder.name: binder.bind(args) for binder in self.params}
+        if self.api_slot is not None:
+            guard_args[API_PARAM] = api
         return guard_args
 
+class ToolguardRuntime:
+    """
+    Runs the generated tool guards.
+
+    A runtime is safe to share between threads: guard modules are loaded once, under a lock, 
+    and checking a tool call does not mutate shared state.
+    It is also fork safe. Call `preload()` in the master process (eg: a gunicorn app with `preload_app`),
+    and forked workers start with all the guards loaded. The locks of the runtime, of `HistogramMetricsSink` 
+    and of `CachingToolInvoker` are recreated in the child process, and its thread pools are restarted.
+    Background threads do not survive a fork: preload synchronously before forking, and call `watch()` again in the child.
+    """
+
+    def __init__(self, result: Union[RuntimeManifest, ToolGuardsCodeGenerationResult], ctx_dir: str, lazy: bool = False, warmup_tools: Optional[List[str]] = None, 
+            item_guards_execution: ItemGuardsExecution = ItemGuardsExecution.sequential, memoized_tools: Optional[Set[str]] = None,
+            metrics: Optional[IMetricsSink] = None, time_budget: Optional[float] = None, 
+            budget_exceeded: BudgetExceededPolicy = BudgetExceededPolicy.fail_closed, max_abandoned_checks: int = 64,
+            async_max_workers: int = 32, async_tool_timeout: Optional[float] = 60.0) -> None:
+        """
+        Args:
+            result: the runtime manifest of the generated guards, or the generation result.
+            ctx_dir: root folder of the generated python code, or a bundle file.
+            lazy: if True, the guard module of a tool is imported on its first `check_toolcall`, instead of at startup.
+            warmup_tools: tools to preload in a background thread. Relevant in lazy mode.
+            item_guards_execution: how the policy items guards of a tool are run. Concurrent modes run them in a thread pool.
+            memoized_tools: read-only tools whose results are memoized during a single `check_toolcall`. 
+                State mutating tools should never be listed.
+            metrics: receives the execution time of the tool guards and of their policy items.
+            time_budget: maximal duration of a `check_toolcall`, in seconds. When set, each guard check runs in its own daemon thread.
+                A guard that exceeds the budget cannot be interrupted. It keeps running in the background, and its outcome is ignored.
+                Stuck guards never delay the checks of later tool calls.
+            budget_exceeded: what to do with a tool call whose guard exceeded the time budget.
+            max_abandoned_checks: maximal number of guard checks that exceeded the time budget and are still running.
+                Beyond it, no thread is started and tool calls are rejected with a `GuardTimeoutException`, whatever the `budget_exceeded` policy,
+                until some of these checks complete. The number is reported to `metrics`.
+            async_max_workers: number of threads running the guards of `check_toolcall_async`. 
+                More concurrent async checks wait for a thread, without blocking the event loop.
+            async_tool_timeout: maximal duration of a dependent tool invocation awaited by a guard in `check_toolcall_async`, in seconds.
+        """
+        self._ctx_dir = ctx_dir
+        self._manifest = result if isinstance(result, RuntimeManifest) else RuntimeManifest.from_result(result)
+        self._bundle = is_bundle(ctx_dir)
+        if self._bundle:
+            bundle_path = os.path.abspath(ctx_dir)
+            if bundle_path not in sys.path:
+                sys.path.insert(0, bundle_path)
+        self._item_guards_execution = item_guards_execution
+        self._memoized_tools = set(memoized_tools or [])
+        self._metrics = metrics
+        self._time_budget = time_budget
+        self._budget_exceeded = budget_exceeded
+        self._max_abandoned_checks = max_abandoned_checks
+        self._abandoned_checks = 0
+        self._budget_lock = threading.Lock()
+        self._async_max_workers = async_max_workers
+        self._async_tool_timeout = async_tool_timeout
+        self._async_pool: Optional[ThreadPoolExecutor] = None
+        self._fingerprints: Dict[str, Dict[str, str]] = {} # tool name -> guard and item guard file names -> content digest
+        self._reload_lock = threading.Lock()
+        self._watch_stop: Optional[threading.Event] = None
+        self._module_loads = 0
+        self._api_impl_cls: Optional[Type] = None
+        self._api_impl_mtime: Optional[float] = None
+        self._plans: Dict[str, ToolCallPlan] = {}
+        self._plans_lock = threading.RLock()
+        _fork_safe_objects.add(self)
+        if not lazy:
+            self.preload()
+        if warmup_tools:
+            self.warmup(warmup_tools)
+
+    def _plan(self, tool_name: str)->Optional[ToolCallPlan]:
+        plan = self._plans.get(tool_name)
+        if plan is not None:
+            return plan
+        tool = self._manifest.tools.get(tool_name)
+        if tool is None: #No guard assigned to this tool
+            return None
+        with self._plans_lock:
+            plan = self._plans.get(tool_name)
+            if plan is None:
+                if not self._bundle:
+                    self._fingerprints[tool_name] = self._fingerprint(tool)
+                module = self._load_module(tool.guard_file)
+                if self._bundle: # imported by the guard module
+                    for item_file in tool.item_guard_files:
+                        item_module = sys.modules.get(file_to_module(item_file))
+                        if item_module is not None:
+                            self._check_bundled(item_module)
+                plan = self._plans[tool_name] = self._make_plan(module, tool)
+        return plan
+
+    def _make_plan(self, module: ModuleType, tool: ToolGuardManifest)->ToolCallPlan:
+        guard_fn =find_function_in_module(module, tool.guard_fn_name)
+        assert guard_fn, "Guard not found"
+        return ToolCallPlan(guard_fn)
+
+    def _fingerprint(self, tool: ToolGuardManifest)->Dict[str, str]:
+        return {file_name: modules_registry.digest(file_name, self._ctx_dir) for file_name in [tool.guard_file] + tool.item_guard_files}
+
+    def reload(self, filename: str = RESULTS_FILENAME)->List[str]:
+        """
+        Re-reads the runtime manifest (or the results file), and reloads the guards of the tools whose guard file or item guard files changed.
+        Each reloaded guard is swapped atomically: calls in flight complete with the previous version.
+        Guards that were not loaded yet (in lazy mode) are loaded from the new files on their first call.
+
+        Returns:
+            The names of the swapped tools.
+        """
+        assert not self._bundle, "Bundles cannot be reloaded"
+        start = time.perf_counter()
+        with self._reload_lock:
+            manifest = read_manifest(self._ctx_dir, filename)
+            new_plans: Dict[str, Tuple[ToolCallPlan, Dict[str, str]]] = {}
+            for tool_name, tool in manifest.tools.items():
+                if tool_name not in self._plans:
+                    continue
+                fingerprint = self._fingerprint(tool)
+                old_fingerprint = self._fingerprints.get(tool_name, {})
+                if fingerprint == old_fingerprint:
+                    continue
+                # Changed item modules are executed again before the guard module, which imports them
+                changed_items = [item_file for item_file in tool.item_guard_files if fingerprint[item_file] != old_fingerprint.get(item_file)]
+                for item_file in changed_items:
+                    reload_module_from_path(item_file, self._ctx_dir)
+                module = reload_module_from_path(tool.guard_file, self._ctx_dir)
+                with self._plans_lock:
+                    self._module_loads += len(changed_items) + 1
+                new_plans[tool_name] = (self._make_plan(module, tool), fingerprint)
+
+            with self._plans_lock:
+                self._manifest = manifest
+                for tool_name in [tool_name for tool_name in self._plans if tool_name not in manifest.tools]:
+                    del self._plans[tool_name]
+                    self._fingerprints.pop(tool_name, None)
+                for tool_name, (plan, fingerprint) in new_plans.items():
+                    self._plans[tool_name] = plan
+                    self._fingerprints[tool_name] = fingerprint
+        logger.info(f"Reloaded the guards in {(time.perf_counter() - start) * 1000:.1f}ms. {len(new_plans)} tools swapped: {sorted(new_plans)}")
+        return list(new_plans)
+
+    def watch(self, interval: float = 1.0, filename: str = RESULTS_FILENAME)->threading.Thread:
+        """
+        Polls the context folder in a background daemon thread, and calls `reload()` when the runtime manifest, 
+        the results file, or one of the guard files, is modified.
+        """
+        assert not self._bundle, "Bundles cannot be reloaded"
+        self.stop_watching()
+        stop = self._watch_stop = threading.Event()
+        last = self._files_signature(filename)
+        def poll():
+            nonlocal last
+            while not stop.wait(interval):
+                signature = self._files_signature(filename)
+                if signature == last:
+                    continue
+                last = signature
+                try:
+                    self.reload(filename)
+                except Exception as ex: # eg: files are still being written. Retried on their next modification
+                    logger.warning(f"Failed to reload the guards from {self._ctx_dir}: {ex}")
+        thread = threading.Thread(target=poll, name="toolguard-watch", daemon=True)
+        thread.start()
+        return thread
+
+    def stop_watching(self):
+        if self._watch_stop:
+            self._watch_stop.set()
+            self._watch_stop = None
+
+    def _files_signature(self, filename: str)->List[Tuple[str, int, int]]:
+        file_names = [RUNTIME_MANIFEST_FILENAME, filename]
+        for tool in self._manifest.tools.values():
+            file_names.append(tool.guard_file)
+            file_names.extend(tool.item_guard_files)
+        signature = []
+        for file_name in file_names:
+            try:
+                st = os.stat(os.path.join(self._ctx_dir, file_name))
+                signature.append((file_name, st.st_mtime_ns, st.st_size))
+            except OSError:
+                signature.append((file_name, -1, -1))
+        return signature
+
+    def preload(self):
+        """Loads the guards of all the tools, and the api implementation, in the calling thread."""
+        for tool_name in self._manifest.tools:
+            self._plan(tool_name)
+        if any([plan.api_slot is not None for plan in self._plans.values()]):
+            self._api_impl_class()
+
+    def _after_fork_in_child(self):
+        self._plans_lock = threading.RLock()
+        self._reload_lock = threading.Lock()
+        self._watch_stop = None # the watch thread does not survive the fork. Call `watch()` again in the child
+        self._async_pool = None # neither do the pool threads. A new pool is started on the first async check
+        self._budget_lock = threading.Lock()
+        self._abandoned_checks = 0 # nor the threads of the checks that exceeded the budget
+
+    def warmup(self, tool_names: List[str]) -> threading.Thread:
+        """Preloads the guards of the given tools in a background daemon thread."""
+        def preload():
+            for tool_name in tool_names:
+                try:
+                    self._plan(tool_name)
+                except Exception as ex:
+                    logger.warning(f"Failed to preload the guard of tool '{tool_name}': {ex}")
+        thread = threading.Thread(target=preload, name="toolguard-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    @property
+    def module_loads(self)->int:
+        """
+        Number of modules executed from disk on behalf of this runtime. Stays constant in steady state.
+        Modules already loaded by another runtime of the process, and modules imported by the guard modules, are not counted.
+        """
+        return self._module_loads
+
+    def _load_module(self, file_name: str)->ModuleType:
+        if self._bundle: # bundled modules are imported by name from the zip file
+            module_name = file_to_module(file_name)
+            executed = module_name not in sys.modules
+            module = importlib.import_module(module_name)
+            self._check_bundled(module)
+        else:
+            module, executed = modules_registry.load_executed(file_name, self._ctx_dir)
+        if executed:
+            with self._plans_lock:
+                self._module_loads += 1
+        return module
+
+    def _check_bundled(self, module: ModuleType):
+        # A module of the same name imported before (eg: from a step2 folder) would be reused by the import system
+        bundle_path = os.path.abspath(self._ctx_dir)
+        loader = getattr(module, "__loader__", None)
+        if isinstance(loader, zipimport.zipimporter) and os.path.abspath(loader.archive) == bundle_path:
+            return
+        file = getattr(module, "__file__", None)
+        if file and os.path.abspath(file).startswith(bundle_path + os.sep):
+            return
+        raise ImportError(f"Module '{module.__name__}' was loaded from {file}, not from the bundle {bundle_path}. "
+            "A module of the same name was already imported")
+
+    def _api_impl_class(self)->Type:
+        impl_file = self._manifest.app_api_impl_file
+        mtime = None if self._bundle else os.path.getmtime(os.path.join(self._ctx_dir, impl_file))
+        clazz = self._api_impl_cls
+        if clazz is not None and mtime == self._api_impl_mtime:
+            return clazz
+        with self._plans_lock:
+            if self._api_impl_cls is None or mtime != self._api_impl_mtime:
+                module = self._load_module(impl_file)
+                clazz = find_class_in_module(module, self._manifest.app_api_impl_class_name)
+                assert clazz, f"class {self._manifest.app_api_impl_class_name} not found in {impl_file}"
+                self._api_impl_cls, self._api_impl_mtime = clazz, mtime
+            return self._api_impl_cls
+
+    @property
+    def tool_names(self)->List[str]:
+        """Names of the tools that have a guard."""
+        return list(self._manifest.tools)
+
     def check_toolcall(self, tool_name:str, args: dict, delegate: IToolInvoker):
-        guard_fn = self._guards.get(tool_name)
-        if guard_fn is None: #No guard assigned to this tool
+        plan = self._plan(tool_name)
+        if plan is None: #No guard assigned to this tool
             return
-        guard_fn(**self._make_args(guard_fn, args, delegate))
+        if self._time_budget is None:
+            self._check(plan, tool_name, args, delegate)
+            return
+        if self._abandoned_checks >= self._max_abandoned_checks:
+            if self._metrics:
+                self._metrics.observe_budget_exceeded(tool_name)
+            raise GuardTimeoutException(tool_name, self._time_budget, 
+                f"The guard of tool '{tool_name}' was not run: {self._abandoned_checks} guard checks that exceeded their time budget are still running")
+        # A thread per check, rather than a pool: a looping guard would hold a pool worker forever, 
+        # and the later checks would wait in the pool queue until they exceed their budget.
+        future: Future = Future()
+        ctx = contextvars.copy_context()
+        finished = abandoned = False
+        def run():
+            nonlocal finished
+            error = None
+            try:
+                ctx.run(self._check, plan, tool_name, args, delegate)
+            except BaseException as ex:
+                error = ex
+            with self._budget_lock:
+                finished = True
+                if abandoned:
+                    self._abandoned_checks -= 1
+                    self._report_abandoned_checks()
+            if error is None:
+                future.set_result(None)
+            else:
+                future.set_exception(error)
+        threading.Thread(target=run, name="toolguard-budget", daemon=True).start()
+        futures_wait([future], timeout=self._time_budget)
+        with self._budget_lock:
+            if not finished:
+                abandoned = True
+                self._abandoned_checks += 1
+                self._report_abandoned_checks()
+        if not abandoned:
+            future.result()
+            return
+        if self._metrics:
+            self._metrics.observe_budget_exceeded(tool_name)
+        if self._budget_exceeded == BudgetExceededPolicy.fail_closed:
+            raise GuardTimeoutException(tool_name, self._time_budget)
+        logger.warning(f"The guard of tool '{tool_name}' exceeded its time budget of {self._time_budget}s. The tool call is allowed.")
+
+    def _report_abandoned_checks(self):
+        if self._metrics:
+            self._metrics.observe_abandoned_checks(self._abandoned_checks)
+
+    def _check(self, plan: ToolCallPlan, tool_name:str, args: dict, delegate: IToolInvoker):
+        start = time.perf_counter()
+        tokens = []
+        try:
+            api = None
+            if plan.api_slot is not None:
+                if self._memoized_tools:
+                    delegate = MemoizingInvoker(delegate, self._memoized_tools)
+                api = self._api_impl_class()(delegate)
+            if plan.items_execution_var is not None:
+                tokens.append((plan.items_execution_var, plan.items_execution_var.set(self._item_guards_execution)))
+            if self._metrics and plan.items_observer_var is not None:
+                observer = functools.partial(self._metrics.observe_latency, tool_name)
+                tokens.append((plan.items_observer_var, plan.items_observer_var.set(observer)))
+            plan.guard_fn(**plan.make_args(args, api))
+        finally:
+            for var, token in reversed(tokens):
+                var.reset(token)
+            if self._metrics:
+                self._metrics.observe_latency(tool_name, None, time.perf_counter() - start)
+
+    async def check_toolcall_async(self, tool_name:str, args: dict, delegate: IAsyncToolInvoker, executor: Optional[Executor] = None):
+        """
+        Async version of `check_toolcall`, for asyncio based agents.
+        The guard runs in a worker thread (of the given executor, or of the runtime async pool, see `async_max_workers`), 
+        while its dependent tool lookups are awaited on the event loop. 
+        The worker is blocked until the lookups complete, so the executor must not be the loop default executor.
+        """
+        if tool_name not in self._manifest.tools: #No guard assigned to this tool
+            return
+        loop = asyncio.get_running_loop()
+        bridge = AsyncInvokerBridge(delegate, loop, self._async_tool_timeout)
+        await loop.run_in_executor(executor or self._get_async_pool(), functools.partial(self.check_toolcall, tool_name, args, bridge))
+
+    def _get_async_pool(self)->ThreadPoolExecutor:
+        pool = self._async_pool
+        if pool is None:
+            with self._plans_lock:
+                if self._async_pool is None:
+                    self._async_pool = ThreadPoolExecutor(max_workers=self._async_max_workers, thread_name_prefix="toolguard-async")
+                pool = self._async_pool
+        return pool
+
+    def close(self):
+        """Stops watching the guard files, and shuts down the async guards pool. Checks in flight complete."""
+        self.stop_watching()
+        with self._plans_lock:
+            pool, self._async_pool = self._async_pool, None
+        if pool:
+            pool.shutdown(wait=False)
+
+    def __enter__(self)->'ToolguardRuntime':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def check_batch(self, calls: Iterable[Tuple[str, dict]], delegate: IToolInvoker, max_workers: Optional[int] = None, 
+            read_only_tools: Optional[Set[str]] = None, max_entries: int = 4096)->Iterator[ToolCallCheckResult]:
+        """
+        Checks many tool calls (eg: when replaying conversation logs) on a pool of worker threads.
+        Results are streamed back in the order of the calls.
+        Results of read-only dependent tools (see `CachingToolInvoker`) are shared by all the calls of the batch.
+
+        Args:
+            calls: `(tool_name, args)` pairs.
+            delegate: invoker of the dependent tools. Must be thread safe.
+            max_workers: size of the worker pool.
+            read_only_tools: names of the dependent tools whose results may be reused across the batch.
+            max_entries: maximal number of cached read-only tool results.
+        """
+        workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        invoker = CachingToolInvoker(delegate, read_only_tools, ttl=float("inf"), max_entries=max_entries)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="toolguard-batch") as pool:
+            window = 2 * workers # bounds the number of pending calls, so `calls` is consumed lazily
+            pending: Deque[Future] = deque()
+            for i, (tool_name, args) in enumerate(calls):
+                pending.append(pool.submit(self._check_one, i, tool_name, args, invoker))
+                if len(pending) >= window:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def _check_one(self, index: int, tool_name: str, args: dict, delegate: IToolInvoker)->ToolCallCheckResult:
+        try:
+            self.check_toolcall(tool_name, args, delegate)
+            return ToolCallCheckResult(index=index, tool_name=tool_name, outcome=ToolCallOutcome.passed)
+        except Exception as ex:
+            if is_policy_violation(ex) and not isinstance(ex, GuardTimeoutException): # a timeout is not a verdict of the guard
+                return ToolCallCheckResult(index=index, tool_name=tool_name, outcome=ToolCallOutcome.violation, message=str(ex))
+            return ToolCallCheckResult(index=index, tool_name=tool_name, outcome=ToolCallOutcome.error, message=f"{type(ex).__name__}: {ex}")
+
+def is_policy_violation(ex: BaseException)->bool:
+    # by name, as the guards may be bound to another copy of the data types module (eg: `rt_toolguard.data_types`)
+    return any([cls.__name__ == PolicyViolationException.__name__ for cls in type(ex).__mro__])
 
 def file_to_module(file_path:str):
     return file_path.removesuffix('.py').replace('/', '.')
 
-def load_module_from_path(file_path: str, py_root:str) -> ModuleType:
-    full_path = os.path.abspath(os.path.join(py_root, file_path))
-    if not os.path.exists(full_path):
-        raise ImportError(f"Module file does not exist: {full_path}")
+class ModuleRegistry:
+    """Process-wide registry of the generated python modules.
+
+    Modules are keyed by their absolute path and content hash, so each generated module is executed 
+    once per process, and shared by all `ToolguardRuntime` instances.
+    Loaded modules are registered in `sys.modules` under their dotted name, 
+    so regular imports of the same module (eg: from other guard modules) resolve to the same instance.
+    """
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._modules: Dict[Tuple[str, str], ModuleType] = {}
+        self._digests: Dict[str, Tuple[int, int, str]] = {} # full path -> (mtime_ns, size, sha256)
+        self._executions = 0
 
-    module_name = file_to_module(file_path)
+    @property
+    def executions(self)->int:
+        """Number of modules executed by this registry."""
+        return self._executions
+
+    def load(self, file_path: str, py_root:str) -> ModuleType:
+        return self.load_executed(file_path, py_root)[0]
+
+    def load_executed(self, file_path: str, py_root:str) -> Tuple[ModuleType, bool]:
+        """The module, and whether this call executed it (rather than finding it already loaded)."""
+        full_path = _full_module_path(file_path, py_root)
+        with self._lock:
+            key = (full_path, self._digest(full_path))
+            module = self._modules.get(key)
+            if module is not None:
+                return module, False
+            module = self._adopt_imported(file_path, full_path)
+            executed = module is None
+            if module is None:
+                module = self._exec(file_path, full_path)
+            self._modules[key] = module
+            return module, executed
+
+    def reload(self, file_path: str, py_root:str) -> ModuleType:
+        """Re-executes the module from disk, even if its content did not change. Intended for hot updates."""
+        full_path = _full_module_path(file_path, py_root)
+        with self._lock:
+            self._digests.pop(full_path, None)
+            # the cached bytecode is validated by mtime in seconds and size, so it may miss a quick rewrite
+            try:
+                os.remove(importlib.util.cache_from_source(full_path))
+            except OSError:
+                pass
+            key = (full_path, self._digest(full_path))
+            module = self._exec(file_path, full_path)
+            self._modules[key] = module
+            return module
+
+    def digest(self, file_path: str, py_root:str)->str:
+        """sha256 of the module file content."""
+        with self._lock:
+            return self._digest(_full_module_path(file_path, py_root))
+
+    def _digest(self, full_path: str)->str:
+        st = os.stat(full_path)
+        cached = self._digests.get(full_path)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
+        with open(full_path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        self._digests[full_path] = (st.st_mtime_ns, st.st_size, digest)
+        return digest
+
+    def _adopt_imported(self, file_path: str, full_path: str)->Optional[ModuleType]:
+        # The module was already imported with a regular import statement.
+        # Adopted only if it was loaded from the current file content, as the file may have been edited since
+        module = sys.modules.get(file_to_module(file_path))
+        if module is not None and getattr(module, "__file__", None) and os.path.abspath(module.__file__) == full_path: # type: ignore
+            if not any(m is module for m in self._modules.values()) and _compiled_from(module, full_path):
+                return module
+        return None
+
+    def _exec(self, file_path: str, full_path: str)->ModuleType:
+        module_name = file_to_module(file_path)
+        spec = importlib.util.spec_from_file_location(module_name, full_path)
+        if spec is None or spec.loader is None:
+            raise ImportError(f"Could not load module spec from {full_path}")
+
+        module = importlib.util.module_from_spec(spec)
+        prev = sys.modules.get(module_name)
+        sys.modules[module_name] = module
+        try:
+            spec.loader.exec_module(module)  # type: ignore
+        except Exception as e:
+            if prev is None:
+                sys.modules.pop(module_name, None)
+            else:
+                sys.modules[module_name] = prev
+            raise ImportError(f"Failed to execute module '{module_name}': {e}")
 
-    spec = importlib.util.spec_from_file_location(module_name, full_path)
-    if spec is None or spec.loader is None:
-        raise ImportError(f"Could not load module spec from {full_path}")
+        parent_name, _, child_name = module_name.rpartition('.')
+        parent = sys.modules.get(parent_name) if parent_name else None
+        if parent is not None:
+            setattr(parent, child_name, module)
+        self._executions += 1
+        return module
 
-    module = importlib.util.module_from_spec(spec)
+modules_registry = ModuleRegistry()
+
+# runtimes, metrics sinks and tool caches, whose locks are recreated in a forked child
+_fork_safe_objects: "weakref.WeakSet[Any]" = weakref.WeakSet()
+
+def _after_fork_in_child():
+    # Another thread of the parent process may have held a lock while forking. 
+    # Only the forking thread survives in the child, so the locks would stay acquired forever.
+    modules_registry._lock = threading.RLock()
+    for obj in list(_fork_safe_objects):
+        obj._after_fork_in_child()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+def _compiled_from(module: ModuleType, full_path: str)->bool:
+    """Whether the functions of the module, and of its classes, were compiled from the current content of the file."""
     try:
-        spec.loader.exec_module(module)  # type: ignore
-    except Exception as e:
-        raise ImportError(f"Failed to execute module '{module_name}': {e}")
+        with open(full_path, 'rb') as f:
+            code = compile(f.read(), full_path, "exec", dont_inherit=True)
+    except (OSError, SyntaxError, ValueError):
+        return False
+    compiled: Set[CodeType] = set()
+    stack = [code]
+    while stack:
+        code = stack.pop()
+        compiled.add(code)
+        stack.extend([const for const in code.co_consts if isinstance(const, CodeType)])
+
+    functions = []
+    for obj in list(vars(module).values()):
+        if getattr(obj, "__module__", None) != module.__name__:
+            continue
+        if inspect.isfunction(obj):
+            functions.append(obj)
+        elif inspect.isclass(obj):
+            functions.extend([member for member in vars(obj).values() if inspect.isfunction(member) and member.__module__ == module.__name__])
+    return bool(functions) and all([fn.__code__ in compiled for fn in functions])
 
-    return module
+def _full_module_path(file_path: str, py_root:str)->str:
+    full_path = os.path.abspath(os.path.join(py_root, file_path))
+    if not os.path.exists(full_path):
+        raise ImportError(f"Module file does not exist: {full_path}")
+    return full_path
+
+def load_module_from_path(file_path: str, py_root:str) -> ModuleType:
+    return modules_registry.load(file_path, py_root)
+
+def reload_module_from_path(file_path: str, py_root:str) -> ModuleType:
+    return modules_registry.reload(file_path, py_root)
 
 def find_function_in_module(module: ModuleType, function_name:str):
     func = getattr(module, function_name, None)
@@ -113,27 +939,43 @@ def find_class_in_module(module: ModuleType, class_name:str)-> Optional[Type]:
         return cls
     return None
 
-T = TypeVar("T")
 def guard_methods(obj: T, guards_folder: str) -> T:
-    """Wraps all public bound methods of the given instance using the given wrapper."""
-    for attr_name in dir(obj):
-        if attr_name.startswith("_"):
-            continue
-        attr = getattr(obj, attr_name)
-        if callable(attr):
-            wrapped = guard_before_call(guards_folder)(attr)
-            setattr(obj, attr_name, wrapped)
+    """Wraps the bound methods of the given instance that have tool guards. See `GuardedToolsProxy`."""
+    proxy = GuardedToolsProxy(obj, load_toolguards(guards_folder))
+    for tool_name, tool in proxy.tools.items():
+        setattr(obj, tool_name, tool)
     return obj
 
+READ_ONLY_ATTR = "__toolguard_read_only__"
+
+def read_only_tool(func: Callable)->Callable:
+    """Declares a tool as read-only (no side effects), so its results may be cached by `CachingToolInvoker`."""
+    setattr(func, READ_ONLY_ATTR, True)
+    return func
+
+def is_read_only_tool(func: Any)->bool:
+    while func is not None:
+        if getattr(func, READ_ONLY_ATTR, False):
+            return True
+        func = getattr(func, "__wrapped__", None) or getattr(func, "__func__", None) or getattr(func, "func", None)
+    return False
+
 class ToolMethodsInvoker(IToolInvoker):
     def __init__(self, object:object) -> None:
         self._obj = object
+        self._methods: Dict[str, Callable] = {} # bound methods, looked up once
         
     def invoke(self, toolname: str, arguments: Dict[str, Any], model: Type[T])->T:
-        mtd = getattr(self._obj, toolname)
-        assert callable(mtd), f"Tool {toolname} was not found"
+        mtd = self._methods.get(toolname)
+        if mtd is None:
+            mtd = getattr(self._obj, toolname, None)
+            assert callable(mtd), f"Tool {toolname} was not found"
+            self._methods[toolname] = mtd
         return mtd(**arguments)
 
+    def is_read_only(self, toolname: str)->bool:
+        return is_read_only_tool(getattr(self._obj, toolname, None))
+
 class ToolFunctionsInvoker(IToolInvoker):
     def __init__(self, funcs: List[Callable]) -> None:
         self._funcs_by_name = {func.__name__: func for func in funcs}
@@ -143,14 +985,154 @@ class ToolFunctionsInvoker(IToolInvoker):
         assert callable(func), f"Tool {toolname} was not found"
         return func(**arguments)
 
+    def is_read_only(self, toolname: str)->bool:
+        return is_read_only_tool(self._funcs_by_name.get(toolname))
+
+class ToolCacheStats(BaseModel):
+    hits: int = 0
+    misses: int = 0
+    expirations: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self)->float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+class CachingToolInvoker(IToolInvoker):
+    """
+    Cross-call cache of read-only tool results, in front of another `IToolInvoker`.
+    Entries are keyed by tool name and canonicalized arguments, expire after a TTL, 
+    and the least recently used entries are evicted when the cache is full.
+    
+    Read-only tools are the given `read_only_tools`, and the tools decorated with `@read_only_tool`.
+    Other tools are never cached.
+    """
+    def __init__(self, delegate: IToolInvoker, read_only_tools: Optional[Set[str]] = None, ttl: float = 60.0, 
+            tool_ttls: Optional[Dict[str, float]] = None, max_entries: int = 1024, clock: Callable[[], float] = time.monotonic) -> None:
+        """
+        Args:
+            delegate: the invoker of the actual tools.
+            read_only_tools: names of the tools that may be cached.
+            ttl: default time to live of a cached result, in seconds.
+            tool_ttls: time to live per tool name, overriding `ttl`.
+            max_entries: maximal number of cached results.
+            clock: monotonic clock, in seconds.
+        """
+        self._delegate = delegate
+        self._read_only_tools = set(read_only_tools or [])
+        self._ttl = ttl
+        self._tool_ttls = tool_ttls or {}
+        self._max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[Tuple[str, str], Tuple[float, Any]] = OrderedDict() # key -> (expiry time, result)
+        self._stats: Dict[str, ToolCacheStats] = {}
+        self._lock = threading.Lock()
+        _fork_safe_objects.add(self)
+
+    def _after_fork_in_child(self):
+        self._lock = threading.Lock()
+
+    def is_read_only(self, toolname: str)->bool:
+        return toolname in self._read_only_tools or self._delegate.is_read_only(toolname)
+
+    def invoke(self, toolname: str, arguments: Dict[str, Any], model: Type[T])->T:
+        if not self.is_read_only(toolname):
+            return self._delegate.invoke(toolname, arguments, model)
+
+        key = (toolname, canonical_arguments(arguments))
+        with self._lock:
+            stats = self._stats.setdefault(toolname, ToolCacheStats())
+            entry = self._entries.get(key)
+            if entry is not None:
+                expiry, result = entry
+                if expiry > self._clock():
+                    self._entries.move_to_end(key)
+                    stats.hits += 1
+                    return result
+                del self._entries[key]
+                stats.expirations += 1
+            stats.misses += 1
+
+        result = self._delegate.invoke(toolname, arguments, model)
+
+        with self._lock:
+            self._entries[key] = (self._clock() + self._tool_ttls.get(toolname, self._ttl), result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                (evicted_tool, _), _ = self._entries.popitem(last=False)
+                self._stats.setdefault(evicted_tool, ToolCacheStats()).evictions += 1
+        return result
+
+    def invalidate(self, toolname: Optional[str] = None):
+        """Drops the cached results of the given tool, or of all tools."""
+        with self._lock:
+            for key in [key for key in self._entries if toolname is None or key[0] == toolname]:
+                del self._entries[key]
+
+    def stats(self)->Dict[str, ToolCacheStats]:
+        """Cache statistics per tool name."""
+        with self._lock:
+            return {toolname: stats.model_copy() for toolname, stats in self._stats.items()}
+
+    @property
+    def hit_rate(self)->float:
+        with self._lock:
+            hits = sum([stats.hits for stats in self._stats.values()])
+            total = hits + sum([stats.misses for stats in self._stats.values()])
+        return hits / total if total else 0.0
+
 def guard_before_call(guards_folder: str) -> Callable[[Callable], Callable]:
-    """Decorator factory that logs function calls to the given logfile."""
+    """Decorator factory of bound tool methods, checking the tool guards before each call."""
     toolguards = load_toolguards(guards_folder)
     def decorator(func: Callable) -> Callable:
-        @functools.wraps(func)
-        def wrapper(*args: Any, **kwargs: Any) -> Any:
-            toolguards.check_toolcall(func.__name__, kwargs, ToolMethodsInvoker(func.__self__))
-            return func(*args, **kwargs)
-        return wrapper  # type: ignore
+        return _guarded_method(toolguards, func.__name__, func, ToolMethodsInvoker(func.__self__))
     return decorator
 
+def _guarded_method(toolguards: ToolguardRuntime, tool_name: str, method: Callable, invoker: IToolInvoker)->Callable:
+    sig = inspect.signature(method)
+    check_toolcall = toolguards.check_toolcall
+    @functools.wraps(method)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        check_toolcall(tool_name, sig.bind(*args, **kwargs).arguments if args else kwargs, invoker)
+        return method(*args, **kwargs)
+    return wrapper
+
+class GuardedToolsProxy:
+    """
+    Proxy of a tools object, checking the tool guards before calling its guarded tools.
+
+    The guarded methods are wrapped once, when the proxy is created, and share a single invoker of the proxied object.
+    Calling a tool costs an attribute lookup in the guarded tools table, and the guard check.
+    Other attributes are read from the proxied object. The proxy's own attributes (eg: `tools`) take precedence over tools of the same name,
+    which remain available from `tools`.
+    Dependent tools invoked by the guards are the methods of the proxied object, and are not guarded.
+    """
+    def __init__(self, obj: object, toolguards: ToolguardRuntime, invoker: Optional[IToolInvoker] = None) -> None:
+        """
+        Args:
+            obj: the object whose methods are the tools.
+            toolguards: the guards runtime.
+            invoker: invoker of the dependent tools. Defaults to invoking the methods of `obj`.
+        """
+        self.__obj = obj
+        invoker = invoker or ToolMethodsInvoker(obj)
+        self.__tools: Dict[str, Callable] = {}
+        for tool_name in toolguards.tool_names:
+            method = getattr(obj, tool_name, None)
+            if callable(method):
+                self.__tools[tool_name] = _guarded_method(toolguards, tool_name, method, invoker)
+
+    @property
+    def tools(self)->Dict[str, Callable]:
+        """The guarded tools, by name."""
+        return dict(self.__tools)
+
+    def __getattr__(self, name: str)->Any:
+        # only called for names that are not attributes of the proxy. The private (name mangled) ones are never tool names
+        if name.startswith("_GuardedToolsProxy__"): # not initialized yet (eg: while unpickling)
+            raise AttributeError(name)
+        tool = self.__tools.get(name)
+        if tool is not None:
+            return tool
+        return getattr(self.__obj, name)
@@ -1,15 +1,20 @@
 import argparse
 import asyncio
+import hashlib
 import json
 import os
 import inspect
-from typing import Any, Callable, Dict, List, Optional
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 from pydantic import BaseModel
 from toolguard.llm.tg_litellm import LitellmModel
-from toolguard.llm.tg_llm import TG_LLM
+from toolguard.llm.cache import cached_llm, start_llm_cache_run
+from toolguard.llm.tg_llm import TG_LLM, LLMUsage, llm_usage
 # from toolguard.stages_tptd.create_oas_summary import OASSummarizer
 from toolguard.stages_tptd.utils import read_prompt_file, generate_messages, save_output, find_mismatched_references
 
+logger = logging.getLogger(__name__)
+
 class ToolInfo(BaseModel):
 	name: str
 	description: str
@@ -27,34 +32,133 @@ class ToolInfo(BaseModel):
             parameters=inspect.getdoc(fn)
         )
 
+MAX_LLM_CALLS_ENV = "TOOLGUARD_STEP1_MAX_LLM_CALLS"
+CHECKPOINTS_DIR = "checkpoints"
+
+CHARS_PER_TOKEN = 4 # estimate
+
+class StagePromptStats(BaseModel):
+	calls: int = 0
+	prompt_chars: int = 0
+	prefix_chars: int = 0 # in the invariant prefix of the prompts
+	usage: LLMUsage = LLMUsage() # as reported by the LLM
+
+	@property
+	def prompt_tokens(self)->int:
+		return self.prompt_chars // CHARS_PER_TOKEN
+
+	@property
+	def cacheable_share(self)->float:
+		return self.prefix_chars / self.prompt_chars if self.prompt_chars else 0.0
+
 class TextToolPolicyGenerator:
-	def __init__(self, llm:TG_LLM, policy_document:str, tools:List[ToolInfo], out_dir:str) -> None:
+	def __init__(self, llm:TG_LLM, policy_document:str, tools:List[ToolInfo], out_dir:str, max_llm_calls: Optional[int]=None, resume:bool=False) -> None:
 		self.llm = llm
 		self.policy_document = policy_document
 		self.tools_descriptions = {tool.name: tool.description for tool in tools}
 		self.tools_details = {tool.name: tool for tool in tools}
+		self.tools_catalog = json.dumps(self.tools_descriptions)
+		self._contexts: Dict[tuple, str] = {}
+		self.prompt_stats: Dict[str, StagePromptStats] = {}
 		self.out_dir = out_dir
+		self.resume = resume
+		# bounds the concurrent LLM calls of all the tools and policies
+		self.max_llm_calls = max_llm_calls or int(os.getenv(MAX_LLM_CALLS_ENV) or 8)
+		self._llm_slots = asyncio.Semaphore(self.max_llm_calls)
+
+	def tools_context(self, tool_name:str)->str:
+		key = ("tools", tool_name)
+		if key not in self._contexts:
+			self._contexts[key] = f"Tools Descriptions:{self.tools_catalog}\nTarget Tool:{self.tools_details[tool_name].model_dump_json()}\n"
+		return self._contexts[key]
+
+	def policy_context(self, tool_name:str)->str:
+		key = ("policy", tool_name)
+		if key not in self._contexts:
+			self._contexts[key] = f"Policy Document:{self.policy_document}\n{self.tools_context(tool_name)}"
+		return self._contexts[key]
+
+	async def chat_json(self, stage:str, system_prompt:str, context:str, user_content:str)->dict:
+		"""
+		The prompt starts with the invariant system prompt and context (policy document, tools and target tool),
+		byte identical in all the calls of the stage, so provider prompt caching applies. The call specific content comes last.
+		"""
+		stats = self.prompt_stats.setdefault(stage, StagePromptStats())
+		stats.calls += 1
+		stats.prefix_chars += len(system_prompt) + len(context)
+		stats.prompt_chars += len(system_prompt) + len(context) + len(user_content)
+		async with self._llm_slots:
+			token = llm_usage.set(stats.usage)
+			try:
+				return await self.llm.chat_json(generate_messages(system_prompt, context + user_content))
+			finally:
+				llm_usage.reset(token)
+
+	async def chat_json_all(self, stage:str, context:str, requests:List[tuple])->List[dict]:
+		"""Sends the (system_prompt, user_content) requests concurrently. The responses are in the requests order."""
+		return await asyncio.gather(*[self.chat_json(stage, system_prompt, context, user_content) for system_prompt, user_content in requests])
+
+	def log_prompt_stats(self):
+		for stage, stats in self.prompt_stats.items():
+			logger.info(f"{stage}: {stats.calls} calls, ~{stats.prompt_tokens} prompt tokens, {stats.cacheable_share:.0%} in the cacheable prefix. "
+				f"LLM reported: {stats.usage.prompt_tokens} prompt tokens, {stats.usage.cached_prompt_tokens} cached")
 	
+	def checkpoint_key(self, tool_name:str, stage:str, prompt_name:Optional[str], tptd:Optional[dict])->str:
+		"""Hash of a stage inputs: its system prompt, the LLM model, the policy document, the tools, and the stage input TPTD."""
+		inputs = {
+			"stage": stage,
+			"prompt": hashlib.sha256(read_prompt_file(prompt_name).encode("utf-8")).hexdigest() if prompt_name else None,
+			"model": getattr(self.llm, "model_name", None) or getattr(getattr(self.llm, "llm", None), "model_name", None),
+			"context": self.policy_context(tool_name),
+			"tptd": tptd
+		}
+		return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode("utf-8")).hexdigest()
+
+	async def run_stage(self, tool_name:str, stage:str, prompt_name:Optional[str], tptd:Optional[dict], fn:Callable[[], Awaitable[dict]])->dict:
+		"""
+		Runs a stage of the pipeline, and saves its output as a checkpoint.
+		When resuming, a checkpoint from a previous run with the same inputs, including the `prompt_name` system prompt, is returned instead.
+		"""
+		key = self.checkpoint_key(tool_name, stage, prompt_name, tptd) # before the stage, which may modify the tptd
+		path = os.path.join(self.out_dir, CHECKPOINTS_DIR, f"{tool_name}_{stage}.json")
+		if self.resume and os.path.isfile(path):
+			try:
+				with open(path, "r") as f:
+					checkpoint = json.load(f)
+				if checkpoint.get("key") == key:
+					logger.info(f"{tool_name}: {stage} resumed from checkpoint")
+					return checkpoint["output"]
+			except (OSError, ValueError) as ex:
+				logger.warning(f"Ignoring the checkpoint {path}: {ex}")
+
+		output = await fn()
+		os.makedirs(os.path.dirname(path), exist_ok=True)
+		tmp_path = f"{path}.tmp"
+		with open(tmp_path, "w") as f:
+			json.dump({"key": key, "output": output}, f)
+		os.replace(tmp_path, path)
+		return output
+
 	async def generate_minimal_policy(self, tool_name:str)->dict:
-		tptd = await self.create_policy(tool_name)
-		tptd = await self.example_creator(tool_name,tptd)
+		tptd = await self.run_stage(tool_name, "create_policy", "create_policy", None, lambda: self.create_policy(tool_name))
+		tptd = await self.run_stage(tool_name, "example_creator", "create_examples", tptd, lambda: self.example_creator(tool_name,tptd))
 		return tptd
 		
 	async def generate_policy(self, tool_name: str)->dict:
-		tptd = await self.create_policy(tool_name)
+		tptd = await self.run_stage(tool_name, "create_policy", "create_policy", None, lambda: self.create_policy(tool_name))
 		for i in range(3):
-			tptd = await self.add_policies(tool_name, tptd, i)
-		tptd = await self.split(tool_name, tptd)
-		tptd = await self.merge(tool_name, tptd)
-		tptd = await self.review_policy(tool_name, tptd)
-		tptd = await self.add_references(tool_name, tptd)
-		tptd = await self.reference_correctness(tool_name, tptd)
-		tptd = await self.example_creator(tool_name, tptd)
+			tptd = await self.run_stage(tool_name, f"add_policies_{i}", "add_policies", tptd, lambda: self.add_policies(tool_name, tptd, i))
+		tptd = await self.run_stage(tool_name, "split", "split", tptd, lambda: self.split(tool_name, tptd))
+		tptd = await self.run_stage(tool_name, "merge", "merge", tptd, lambda: self.merge(tool_name, tptd))
+		tptd = await self.run_stage(tool_name, "review_policy", "policy_reviewer", tptd, lambda: self.review_policy(tool_name, tptd))
+		tptd = await self.run_stage(tool_name, "add_references", "add_references", tptd, lambda: self.add_references(tool_name, tptd))
+		tptd = await self.run_stage(tool_name, "reference_correctness", None, tptd, lambda: self.reference_correctness(tool_name, tptd))
+		tptd = await self.run_stage(tool_name, "example_creator", "create_examples", tptd, lambda: self.example_creator(tool_name, tptd))
 		for i in range(5): #FIXME
-			tptd = await self.add_examples(tool_name, tptd, i)
-		tptd = await self.merge_examples(tool_name, tptd)
+			tptd = await self.run_stage(tool_name, f"add_examples_{i}", "add_examples", tptd, lambda: self.add_examples(tool_name, tptd, i))
+		tptd = await self.run_stage(tool_name, "merge_examples", "merge_examples", tptd, lambda: self.merge_examples(tool_name, tptd))
 		#tptd = self.fix_examples(tool_name, tptd)
-		tptd = await self.review_examples(tool_name, tptd)
+		tptd = await self.run_stage(tool_name, "review_examples", "examples_reviewer", tptd, lambda: self.review_examples(tool_name, tptd))
 		return tptd
 		
 		
@@ -62,8 +166,7 @@ class TextToolPolicyGenerator:
 		print("policy_creator_node")
 		system_prompt = read_prompt_file("create_policy")
 		system_prompt = system_prompt.replace("ToolX",tool_name)
-		user_content = f"Policy Document:{self.policy_document}\nTools Descriptions:{json.dumps(self.tools_descriptions)}\nTarget Tool:{self.tools_details[tool_name].model_dump_json()}\n"
-		tptd = await self.llm.chat_json(generate_messages(system_prompt, user_content))
+		tptd = await self.chat_json("create_policy", system_prompt, self.policy_context(tool_name), "")
 		save_output(self.out_dir, f"{tool_name}.json", tptd)
 		return tptd
 	
@@ -72,8 +175,8 @@ class TextToolPolicyGenerator:
 	async def add_policies(self, tool_name:str, tptd:dict, iteration:int=0) -> dict:
 		print("add_policy")
 		system_prompt = read_prompt_file("add_policies")
-		user_content = f"Policy Document:{self.policy_document}\nTools Descriptions:{json.dumps(self.tools_descriptions)}\nTarget Tool:{self.tools_details[tool_name].model_dump_json()}\nTPTD: {json.dumps(tptd)}"
-		response = await self.llm.chat_json(generate_messages(system_prompt, user_content))
+		user_content = f"TPTD: {json.dumps(tptd)}"
+		response = await self.chat_json("add_policies", system_prompt, self.policy_context(tool_name), user_content)
 
 		policies = response["additionalProperties"]["policies"] \
 			if "additionalProperties" in response and "policies" not in response \
@@ -92,8 +195,8 @@ class TextToolPolicyGenerator:
 		# todo: consider addition step to split policy by policy and not overall
 		print("split")
 		system_prompt = read_prompt_file("split")
-		user_content = f"Policy Document:{self.policy_document}\nTools Descriptions:{json.dumps(self.tools_descriptions)}\nTarget Tool:{self.tools_details[tool_name].model_dump_json()}\nTPTD: {json.dumps(tptd)}"
-		tptd = await self.llm.chat_json(generate_messages(system_prompt, user_content))
+		user_content = f"TPTD: {json.dumps(tptd)}"
+		tptd = await self.chat_json("split", system_prompt, self.policy_context(tool_name), user_content)
 		save_output(self.out_dir, f"{tool_name}_split.json", tptd)
 		return tptd
 	
@@ -101,8 +204,8 @@ class TextToolPolicyGenerator:
 		# todo: consider addition step to split policy by policy and not overall
 		print("merge")
 		system_prompt = read_prompt_file("merge")
-		user_content = f"Policy Document:{self.policy_document}\nTools Descriptions:{json.dumps(self.tools_descriptions)}\nTarget Tool:{self.tools_details[tool_name].model_dump_json()}\nTPTD: {json.dumps(tptd)}"
-		tptd = await self.llm.chat_json(generate_messages(system_prompt, user_content))
+		user_content = f"TPTD: {json.dumps(tptd)}"
+		tptd = await self.chat_json("merge", system_prompt, self.policy_context(tool_name), user_content)
 		
 		save_output(self.out_dir, f"{tool_name}_merge.json", tptd)
 		return tptd
@@ -144,11 +247,17 @@ class TextToolPolicyGenerator:
 		if 'policies' not in tptd:
 			tptd['policies'] = []
 
+		# the 5 reviews of all the policies run concurrently, so they all review the original policy descriptions
+		n_reviews = 5
+		requests = []
 		for policy in tptd["policies"]:
+			user_content = f"policy: {json.dumps(policy)}"
+			requests.extend([(system_prompt, user_content)] * n_reviews)
+		responses = await self.chat_json_all("review_policy", self.policy_context(tool_name), requests)
+
+		for i, policy in enumerate(tptd["policies"]):
 			reviews = []
-			for iteration in range(5):
-				user_content = f"Policy Document:{self.policy_document}\nTools Descriptions:{json.dumps(self.tools_descriptions)}\nTarget Tool:{json.dumps(self.tools_descriptions[tool_name])}\npolicy: {json.dumps(policy)}"
-				response = await self.llm.chat_json(generate_messages(system_prompt, user_content))
+			for response in responses[i * n_reviews: (i + 1) * n_reviews]:
 				if "is_self_contained" in response:
 					is_self_contained = response["is_self_contained"]
 					if not is_self_contained:
@@ -175,10 +284,14 @@ class TextToolPolicyGenerator:
 		print("add_ref")
 		system_prompt = read_prompt_file("add_references")
 		#remove old refs (used to help avoid duplications)
+		requests = []
 		for policy in tptd["policies"]:
 			policy["references"] = []
-			user_content = f"Policy Document:{self.policy_document}\nTools Descriptions:{json.dumps(self.tools_descriptions)}\nTarget Tool:{self.tools_details[tool_name].model_dump_json()}\npolicy: {json.dumps(policy)}"
-			response = await self.llm.chat_json(generate_messages(system_prompt, user_content))
+			user_content = f"policy: {json.dumps(policy)}"
+			requests.append((system_prompt, user_content))
+		responses = await self.chat_json_all("add_references", self.policy_context(tool_name), requests)
+
+		for policy, response in zip(tptd["policies"], responses):
 			if "references" in response:
 				policy["references"] = response["references"]
 			else:
@@ -201,11 +314,14 @@ class TextToolPolicyGenerator:
 		system_prompt = read_prompt_file("create_examples")
 		system_prompt = system_prompt.replace("ToolX",tool_name)
 		
+		requests = []
 		for policy in tptd["policies"]:
 			#user_content = f"Policy Document:{state['policy_text']}\nTools Descriptions:{json.dumps(state['tools'])}\nTarget Tool:{json.dumps(state['target_tool_description'])}\nPolicy:{policy}"
-			user_content = f"Tools Descriptions:{json.dumps(self.tools_descriptions)}\nTarget Tool:{self.tools_details[tool_name].model_dump_json()}\nPolicy:{policy}"
-			
-			response = await self.llm.chat_json(generate_messages(system_prompt, user_content))
+			user_content = f"Policy:{policy}"
+			requests.append((system_prompt, user_content))
+		responses = await self.chat_json_all("example_creator", self.tools_context(tool_name), requests)
+
+		for policy, response in zip(tptd["policies"], responses):
 			if 'violating_examples' in response:
 				policy["violating_examples"] = response["violating_examples"]
 				
@@ -219,10 +335,14 @@ class TextToolPolicyGenerator:
 		print("add_examples")
 		system_prompt = read_prompt_file("add_examples")
 		system_prompt = system_prompt.replace("ToolX", tool_name)
+		requests = []
 		for policy in tptd["policies"]:
 			#user_content = f"Policy Document:{state['policy_text']}\nTools Descriptions:{json.dumps(state['tools'])}\nTarget Tool:{json.dumps(state['target_tool_description'])}\nPolicy:{policy}"
-			user_content = f"Tools Descriptions:{json.dumps(self.tools_descriptions)}\nTarget Tool:{self.tools_details[tool_name].model_dump_json()}\nPolicy:{policy}"
-			response = await self.llm.chat_json(generate_messages(system_prompt, user_content))
+			user_content = f"Policy:{policy}"
+			requests.append((system_prompt, user_content))
+		responses = await self.chat_json_all("add_examples", self.tools_context(tool_name), requests)
+
+		for policy, response in zip(tptd["policies"], responses):
 			if 'violating_examples' in response:
 				for vexample in response["violating_examples"]:
 					#vexample["iteration"] = state["iteration"]
@@ -243,12 +363,16 @@ class TextToolPolicyGenerator:
 		print("merge_examples")
 		system_prompt = read_prompt_file("merge_examples")
 		system_prompt = system_prompt.replace("ToolX", tool_name)
+		requests = []
 		for policy in tptd["policies"]:
 			#user_content = f"Policy Document:{state['policy_text']}\nTools Descriptions:{json.dumps(state['tools'])}\nTarget Tool:{json.dumps(state['target_tool_description'])}\nPolicy Name:{policy['policy_name']}\nPolicy Description:{policy['description']}"
-			user_content = f"Tools Descriptions:{json.dumps(self.tools_descriptions)}\nTarget Tool:{self.tools_details[tool_name].model_dump_json()}\nPolicy Name:{policy['policy_name']}\nPolicy Description:{policy['description']}"
+			user_content = f"Policy Name:{policy['policy_name']}\nPolicy Description:{policy['description']}"
 			user_content+= f"\n\nViolating Examples: {policy['violating_examples']}"
 			user_content+= f"\n\nCompliance Examples: {policy['compliance_examples']}"
-			response = await self.llm.chat_json(generate_messages(system_prompt, user_content))
+			requests.append((system_prompt, user_content))
+		responses = await self.chat_json_all("merge_examples", self.tools_context(tool_name), requests)
+
+		for policy, response in zip(tptd["policies"], responses):
 			policy["violating_examples"] = response["violating_examples"]
 			policy["compliance_examples"] = response["compliance_examples"]
 
@@ -259,19 +383,22 @@ class TextToolPolicyGenerator:
 	async def fix_examples(self, tool_name:str,tptd:dict) -> dict:
 		print("fix_examples")
 		orig_prompt = read_prompt_file("fix_example")
+		requests = []
 		for policy in tptd["policies"]:
 			for etype in ["violating","compliance"]:
-				fixed_examples = []
 				for example in policy[etype + "_examples"]:
 					system_prompt = orig_prompt.replace("ToolX", tool_name)
 					system_prompt = system_prompt.replace("__EXAMPLE_TYPE__", "")
 			
 					#user_content = f"Policy Document:{state['policy_text']}\nTools Descriptions:{json.dumps(state['tools'])}\nTarget Tool:{json.dumps(state['target_tool_description'])}\nPolicy Name:{policy['policy_name']}\nPolicy Description:{policy['description']}\nExample:{example}"
-					user_content = f"Tools Descriptions:{json.dumps(self.tools_descriptions)}\nTarget Tool:{self.tools_details[tool_name].model_dump_json()}\nPolicy Name:{policy['policy_name']}\nPolicy Description:{policy['description']}\nExample:{example}"
+					user_content = f"Policy Name:{policy['policy_name']}\nPolicy Description:{policy['description']}\nExample:{example}"
 					
-					response = await self.llm.chat_json(generate_messages(system_prompt, user_content))
-					fixed_examples.append(response["revised_example"])
-				policy[etype + "_examples"] = fixed_examples
+					requests.append((system_prompt, user_content))
+		responses = iter(await self.chat_json_all("fix_examples", self.tools_context(tool_name), requests))
+
+		for policy in tptd["policies"]:
+			for etype in ["violating","compliance"]:
+				policy[etype + "_examples"] = [next(responses)["revised_example"] for _ in policy[etype + "_examples"]]
 		
 	
 		save_output(self.out_dir, f"{tool_name}_fix_examples.json", tptd)
@@ -281,6 +408,16 @@ class TextToolPolicyGenerator:
 	async def review_examples(self, tool_name:str,tptd:dict) -> dict:
 		print("review_examples")
 		system_prompt = read_prompt_file("examples_reviewer")
+		n_reviews = 5
+		requests = []
+		for policy in tptd["policies"]:
+			for etype in ["violating","compliance"]:
+				for example in policy[etype + "_examples"]:
+					#user_content = f"Policy Document:{state['policy_text']}\nTools Descriptions:{json.dumps(state['tools'])}\nTarget Tool:{json.dumps(state['target_tool_description'])}\nPolicy Name:{policy['policy_name']}\nPolicy Description:{policy['description']}\nExample:{example}"
+					user_content = f"Policy Name:{policy['policy_name']}\nPolicy Description:{policy['description']}\nExample:{example}"
+					requests.extend([(system_prompt, user_content)] * n_reviews)
+		responses = iter(await self.chat_json_all("review_examples", self.tools_context(tool_name), requests))
+
 		for policy in tptd["policies"]:
 			print(policy['policy_name'])
 			for etype in ["violating","compliance"]:
@@ -288,12 +425,7 @@ class TextToolPolicyGenerator:
 				passed_examples = []
 				for example in policy[etype + "_examples"]:
 					print(example)
-					reviews = []
-					for iteration in range(5):
-						#user_content = f"Policy Document:{state['policy_text']}\nTools Descriptions:{json.dumps(state['tools'])}\nTarget Tool:{json.dumps(state['target_tool_description'])}\nPolicy Name:{policy['policy_name']}\nPolicy Description:{policy['description']}\nExample:{example}"
-						user_content = f"Tools Descriptions:{json.dumps(self.tools_descriptions)}\nTarget Tool:{self.tools_details[tool_name].model_dump_json()}\nPolicy Name:{policy['policy_name']}\nPolicy Description:{policy['description']}\nExample:{example}"
-						response = await self.llm.chat_json(generate_messages(system_prompt, user_content))
-						reviews.append(response)
+					reviews = [next(responses) for _ in range(n_reviews)]
 					keep = self.keep_example(reviews)
 					if keep:
 						passed_examples.append(example)
@@ -318,7 +450,7 @@ class TextToolPolicyGenerator:
 			return False
 		return True
 
-async def step1_main(policy_text:str, tools:List[ToolInfo], step1_output_dir:str, llm:TG_LLM, tools_shortlist: Optional[List[str]]=None, short=False):
+async def step1_main(policy_text:str, tools:List[ToolInfo], step1_output_dir:str, llm:TG_LLM, tools_shortlist: Optional[List[str]]=None, short=False, resume=False):
 	if not os.path.isdir(step1_output_dir):
 		os.makedirs(step1_output_dir)
 		
@@ -326,7 +458,8 @@ async def step1_main(policy_text:str, tools:List[ToolInfo], step1_output_dir:str
 	if not os.path.isdir(process_dir):
 		os.makedirs(process_dir)
 	
-	tpg = TextToolPolicyGenerator(llm, policy_text, tools, process_dir)
+	cache = start_llm_cache_run()
+	tpg = TextToolPolicyGenerator(cached_llm(llm), policy_text, tools, process_dir, resume=resume)
 	async def do_one_tool(fname):
 		if short:
 			final_output = await tpg.generate_minimal_policy(fname)
@@ -337,6 +470,10 @@ async def step1_main(policy_text:str, tools:List[ToolInfo], step1_output_dir:str
 			outfile1.write(json.dumps(final_output, indent=2))
 
 	await asyncio.gather(*[do_one_tool(tool.name) for tool in tools if ((tools_shortlist is None) or (tool.name in tools_shortlist))])
+	tpg.log_prompt_stats()
+	save_output(process_dir, "prompt_stats.json", {stage: stats.model_dump() | {"prompt_tokens": stats.prompt_tokens, "cacheable_share": stats.cacheable_share} for stage, stats in tpg.prompt_stats.items()})
+	if cache:
+		cache.log_stats()
 	print("All tools done")
 
 
@@ -369,6 +506,7 @@ if __name__ == '__main__':
 	parser.add_argument('--out-dir', type=str,default='/Users/me/Documents/OASB/policy_validation/airline/outdir2/step1_out')
 	parser.add_argument('--tools', nargs='+', default=None, help='Optional list of tool names. These are a subset of the tools in the openAPI operation ids.')
 	parser.add_argument('--short-step1', action='store_true', default=False, help='run short version of step 1')
+	parser.add_argument('--resume', action='store_true', default=False, help='resume step 1, skipping the stages with a checkpoint from a previous run with the same inputs')
 	args = parser.parse_args()
 	if not args.oas and not args.tools_info_path:
 		parser.error("You must provide at least one of --oas or --tools-info-path")
@@ -403,7 +541,7 @@ if __name__ == '__main__':
 	llm = LitellmModel(args.model_name, "azure")
 	
 	asyncio.run(
-		step1_main(policy_text, tools_info, args.out_dir, llm, args.tools, args.short_step1)
+		step1_main(policy_text, tools_info, args.out_dir, llm, args.tools, args.short_step1, args.resume)
 	)
 	
 
@@ -1,13 +1,20 @@
 import json
+import logging
 import os
 import subprocess
+import threading
+import time
+from pathlib import Path
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from toolguard.data_types import FileTwin
 
+logger = logging.getLogger(__name__)
+
 ERROR = "error"
 WARNING = "warning"
+INFORMATION = "information"
 
 class Position(BaseModel):
     line: int
@@ -62,6 +69,16 @@ def get_text_by_range(file_content: str, rng: Range)-> str:
 
 
 def run(folder:str, py_file:str, venv_name:str)->DiagnosticsReport:
+    """Type checks a file. Uses the pyright server started by `server()` for this folder and venv, if any."""
+    srv = _servers.get((os.path.abspath(folder), venv_name))
+    if srv is not None:
+        try:
+            return srv.check(py_file)
+        except Exception as ex:
+            logger.warning(f"pyright server failed to check '{py_file}', falling back to the pyright CLI: {ex}")
+    return run_subprocess(folder, py_file, venv_name)
+
+def run_subprocess(folder:str, py_file:str, venv_name:str)->DiagnosticsReport:
     py_path = os.path.join(venv_name, "bin", "python3")
     res = subprocess.run([
             "pyright", 
@@ -80,6 +97,241 @@ def run(folder:str, py_file:str, venv_name:str)->DiagnosticsReport:
     data = json.loads(res.stdout)
     return DiagnosticsReport.model_validate(data)
 
+LSP_SEVERITIES = {1: ERROR, 2: WARNING, 3: INFORMATION}
+FILE_CREATED, FILE_CHANGED, FILE_DELETED = 1, 2, 3 # LSP FileChangeType
+
+class PyrightServer:
+    """
+    A long-lived `pyright-langserver`, speaking LSP over stdio.
+    The python environment and the unchanged modules stay analyzed between checks,
+    so checking a file costs its incremental analysis instead of a node startup and a full analysis.
+    Before each check, the python files of the folder that were written since the previous check are
+    reported to the server as changed, so it does not use a stale analysis of the modules they import.
+    Safe to use from several threads.
+    """
+    def __init__(self, folder: str, venv_name: str, timeout: float = 60.0) -> None:
+        self.folder = os.path.abspath(folder)
+        self.python_path = os.path.join(self.folder, venv_name, "bin", "python3")
+        self.venv_dir = os.path.join(self.folder, venv_name)
+        self.timeout = timeout
+        self._proc = subprocess.Popen(["pyright-langserver", "--stdio"], cwd=self.folder, 
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        self._write_lock = threading.Lock()
+        self._cond = threading.Condition()
+        self._next_id = 0
+        self._responses: Dict[int, Any] = {}
+        self._diagnostics: Dict[str, Tuple[Optional[int], List[dict]]] = {} # uri -> (document version, diagnostics)
+        self._versions: Dict[str, int] = {}
+        self._uri_locks: Dict[str, threading.Lock] = {}
+        self._scan_lock = threading.Lock()
+        self._mtimes = self._scan() # path -> modification time
+        self._version = ""
+        self._closed = False
+        self._reader = threading.Thread(target=self._read_loop, name="pyright-server", daemon=True)
+        self._reader.start()
+        try:
+            self._initialize()
+        except Exception:
+            self._proc.kill()
+            raise
+
+    def _initialize(self):
+        root_uri = Path(self.folder).as_uri()
+        res = self._request("initialize", {
+            "processId": os.getpid(),
+            "rootUri": root_uri,
+            "workspaceFolders": [{"uri": root_uri, "name": os.path.basename(self.folder)}],
+            "capabilities": {
+                "workspace": {"configuration": True, "didChangeWatchedFiles": {"dynamicRegistration": True}},
+                "textDocument": {"publishDiagnostics": {"versionSupport": True}}
+            }
+        })
+        self._version = res.get("serverInfo", {}).get("version", "")
+        self._notify("initialized", {})
+
+    def check(self, py_file: str)->DiagnosticsReport:
+        """Type checks the current content of the file, and reports like `pyright --outputjson`."""
+        full_path = os.path.join(self.folder, py_file)
+        uri = Path(full_path).as_uri()
+        with open(full_path, "r", encoding="utf-8") as f:
+            content = f.read()
+        start = time.time()
+        self._notify_changed_files()
+        with self._cond:
+            uri_lock = self._uri_locks.setdefault(uri, threading.Lock())
+        with uri_lock:
+            with self._cond:
+                version = self._versions[uri] = self._versions.get(uri, 0) + 1
+            self._notify("textDocument/didOpen", {
+                "textDocument": {"uri": uri, "languageId": "python", "version": version, "text": content}
+            })
+            try:
+                with self._cond:
+                    if not self._cond.wait_for(lambda: self._closed or self._diagnostics.get(uri, (None, []))[0] == version, self.timeout):
+                        raise TimeoutError(f"No diagnostics for '{py_file}' after {self.timeout}s")
+                    if self._closed:
+                        raise ConnectionError("pyright server exited")
+                    diagnostics = self._diagnostics.pop(uri)[1]
+            finally:
+                # closed, so the next checks importing this file read it from disk
+                self._notify("textDocument/didClose", {"textDocument": {"uri": uri}})
+        return self._report(full_path, diagnostics, time.time() - start)
+
+    def _scan(self)->Dict[str, int]:
+        mtimes = {}
+        for root, dirs, files in os.walk(self.folder):
+            dirs[:] = [d for d in dirs 
+                if not d.startswith(".") and d != "__pycache__" and os.path.join(root, d) != self.venv_dir]
+            for file_name in files:
+                if file_name.endswith((".py", ".pyi")):
+                    path = os.path.join(root, file_name)
+                    try:
+                        mtimes[path] = os.stat(path).st_mtime_ns
+                    except OSError: # deleted meanwhile
+                        pass
+        return mtimes
+
+    def _notify_changed_files(self):
+        with self._scan_lock:
+            mtimes = self._scan()
+            changes = [{"uri": Path(path).as_uri(), "type": FILE_CREATED if path not in self._mtimes else FILE_CHANGED}
+                for path, mtime in mtimes.items() if self._mtimes.get(path) != mtime]
+            changes.extend([{"uri": Path(path).as_uri(), "type": FILE_DELETED}
+                for path in self._mtimes if path not in mtimes])
+            self._mtimes = mtimes
+            if changes:
+                self._notify("workspace/didChangeWatchedFiles", {"changes": changes})
+
+    def _report(self, full_path: str, diagnostics: List[dict], duration: float)->DiagnosticsReport:
+        general = [GeneralDiagnostic(
+                file=full_path,
+                severity=LSP_SEVERITIES[d.get("severity", 1)],
+                message=d["message"],
+                range=Range.model_validate(d["range"]),
+                rule=d.get("code")
+            ) for d in diagnostics
+            if d.get("severity", 1) in LSP_SEVERITIES] # hints are not reported by the CLI
+        return DiagnosticsReport(
+            version=self._version,
+            time=str(int(time.time() * 1000)),
+            generalDiagnostics=general,
+            summary=Summary(
+                filesAnalyzed=1,
+                errorCount=len([d for d in general if d.severity == ERROR]),
+                warningCount=len([d for d in general if d.severity == WARNING]),
+                informationCount=len([d for d in general if d.severity == INFORMATION]),
+                timeInSec=duration
+            )
+        )
+
+    def _settings(self, section: Optional[str])->Any:
+        settings = {"python": {"pythonPath": self.python_path, "analysis": {}}}
+        value: Any = settings
+        for key in (section or "").split("."):
+            if key:
+                value = value.get(key) if isinstance(value, dict) else None
+        return value
+
+    def _request(self, method: str, params: Any)->Any:
+        with self._cond:
+            self._next_id += 1
+            msg_id = self._next_id
+        self._send({"jsonrpc": "2.0", "id": msg_id, "method": method, "params": params})
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._closed or msg_id in self._responses, self.timeout):
+                raise TimeoutError(f"pyright server did not answer '{method}'")
+            if msg_id not in self._responses:
+                raise ConnectionError("pyright server exited")
+            return self._responses.pop(msg_id)
+
+    def _notify(self, method: str, params: Any):
+        self._send({"jsonrpc": "2.0", "method": method, "params": params})
+
+    def _send(self, msg: dict):
+        body = json.dumps(msg).encode("utf-8")
+        with self._write_lock:
+            assert self._proc.stdin
+            self._proc.stdin.write(f"Content-Length: {len(body)}\r\n\r\n".encode("ascii") + body)
+            self._proc.stdin.flush()
+
+    def _read_loop(self):
+        stdout = self._proc.stdout
+        assert stdout
+        try:
+            while True:
+                length = 0
+                while True:
+                    line = stdout.readline()
+                    if not line:
+                        return
+                    line = line.strip()
+                    if not line:
+                        break
+                    name, _, value = line.decode("ascii").partition(":")
+                    if name.lower() == "content-length":
+                        length = int(value)
+                self._dispatch(json.loads(stdout.read(length)))
+        finally:
+            with self._cond:
+                self._closed = True
+                self._cond.notify_all()
+
+    def _dispatch(self, msg: dict):
+        method = msg.get("method")
+        if method is None: # response
+            with self._cond:
+                self._responses[msg["id"]] = msg.get("result") or {}
+                self._cond.notify_all()
+        elif method == "textDocument/publishDiagnostics":
+            params = msg["params"]
+            with self._cond:
+                self._diagnostics[params["uri"]] = (params.get("version"), params["diagnostics"])
+                self._cond.notify_all()
+        elif "id" in msg: # server request
+            result = None
+            if method == "workspace/configuration":
+                result = [self._settings(item.get("section")) for item in msg["params"]["items"]]
+            self._send({"jsonrpc": "2.0", "id": msg["id"], "result": result})
+
+    def close(self):
+        if self._proc.poll() is None:
+            try:
+                self._request("shutdown", None)
+                self._notify("exit", None)
+                self._proc.wait(timeout=5)
+            except Exception:
+                self._proc.kill()
+
+    def __enter__(self)->'PyrightServer':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+_servers: Dict[Tuple[str, str], PyrightServer] = {}
+
+class server:
+    """
+    Context manager running a `PyrightServer` for the folder and venv.
+    Within it, `run()` on the same folder and venv uses the server. 
+    If the server cannot start, `run()` keeps using the pyright CLI.
+    """
+    def __init__(self, folder: str, venv_name: str) -> None:
+        self._key = (os.path.abspath(folder), venv_name)
+        self._server: Optional[PyrightServer] = None
+
+    def __enter__(self)->Optional[PyrightServer]:
+        try:
+            self._server = _servers[self._key] = PyrightServer(*self._key)
+        except Exception as ex:
+            logger.warning(f"Failed to start the pyright server, using the pyright CLI: {ex}")
+        return self._server
+
+    def __exit__(self, *args):
+        if self._server:
+            _servers.pop(self._key, None)
+            self._server.close()
+
 def config(folder:str):
     cfg = {
         "typeCheckingMode": "basic",
@@ -1,14 +1,20 @@
-
+from concurrent.futures import Future
 from enum import StrEnum
 import json
+import logging
 import os
 from pathlib import Path
 import subprocess
+import sys
+import threading
+import time
 from typing import Any, List, Dict, Literal, Optional, Set
 from pydantic import BaseModel, Field
 
 from toolguard.data_types import FileTwin
 
+logger = logging.getLogger(__name__)
+
 
 class TestOutcome(StrEnum):
     passed = "passed"
@@ -99,7 +105,47 @@ class TestReport(BaseModel):
                 errors.add(error)
         return list(errors)
 
+DEFAULT_TIMEOUT = 300.0
+ZYGOTE_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pytest_zygote.py")
+
+def timeout_report(folder: str, test_file: str, timeout: float)->TestReport:
+    """The report of a test run that was killed after `timeout` seconds. Its error is reported as a collection failure."""
+    return TestReport(
+        created=time.time(),
+        duration=timeout,
+        exitcode=2, # interrupted
+        root=folder,
+        environment={},
+        summary=Summary(failed=1, total=1, collected=0),
+        collectors=[Collector(nodeid=test_file, outcome=TestOutcome.failed, result=[],
+            longrepr=f"The test run did not complete within {timeout}s, and was killed. A test, or the code under test, may loop forever.")],
+        tests=[]
+    )
+
 def run(folder:str, test_file:str, report_file)->TestReport:
+    """Runs a test file. Uses the workers started by `workers()` for this folder, if any."""
+    pool = _workers.get(os.path.abspath(folder))
+    if pool is not None:
+        try:
+            return pool.run(test_file, report_file)
+        except Exception as ex:
+            logger.warning(f"pytest worker failed to run '{test_file}', falling back to the pytest CLI: {ex}")
+    return run_subprocess(folder, test_file, report_file)
+
+def run_subprocess(folder:str, test_file:str, report_file, timeout: float = DEFAULT_TIMEOUT)->TestReport:
+    try:
+        _run_cli(folder, test_file, report_file, timeout)
+    except subprocess.TimeoutExpired:
+        report = timeout_report(folder, test_file, timeout)
+        _save_report(report, os.path.join(folder, report_file))
+        return report
+    report = read_test_report(os.path.join(folder, report_file))
+
+    #overwrite it with indented version
+    _save_report(report, os.path.join(folder, report_file))
+    return report
+
+def _run_cli(folder:str, test_file:str, report_file, timeout: float):
     subprocess.run([
             "pytest",
             test_file,
@@ -112,14 +158,118 @@ def run(folder:str, test_file:str, report_file)->TestReport:
             **os.environ, 
             "PYTHONPATH": "."
         },
-        cwd=folder)
-    report = read_test_report(os.path.join(folder, report_file))
+        cwd=folder,
+        timeout=timeout)
 
-    #overwrite it with indented version
-    with open(os.path.join(folder, report_file), "w", encoding="utf-8") as f:
+def _save_report(report: TestReport, file_path: str):
+    with open(file_path, "w", encoding="utf-8") as f:
         json.dump(report.model_dump(), f, indent=2)
 
-    return report
+class PytestWorkers:
+    """
+    Runs pytest in-process, in children forked from a pre-warmed process.
+    The pre-warmed process (see `pytest_zygote.py`) imports pytest, its plugins and the given (domain) modules once, 
+    and nothing of the `toolguard` package.
+    Each test run gets a fresh fork, so the modules under test are always imported from their current content.
+    A test run that exceeds the timeout is killed, and reported as failed.
+    Reports are returned directly, instead of being read back from the report file.
+    Safe to use from several threads. Test runs execute concurrently.
+    """
+    def __init__(self, folder: str, preload: Optional[List[str]] = None, timeout: float = DEFAULT_TIMEOUT) -> None:
+        """
+        Args:
+            folder: root folder of the tests, and of the python code.
+            preload: modules to import once, eg: the domain types and api. Modules under test should not be listed.
+            timeout: maximal duration of a test run, in seconds.
+        """
+        self.folder = os.path.abspath(folder)
+        self.timeout = timeout
+        self._proc = subprocess.Popen([sys.executable, ZYGOTE_SCRIPT, self.folder, str(timeout), *(preload or [])],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self._pending: Dict[int, Future] = {}
+        self._reader = threading.Thread(target=self._read_loop, name="pytest-workers", daemon=True)
+        self._reader.start()
+
+    def run(self, test_file: str, report_file: Optional[str] = None)->TestReport:
+        """Runs the tests, and saves the report to `report_file` (relative to the folder), if given."""
+        future: Future = Future()
+        with self._lock:
+            self._next_id += 1
+            self._pending[self._next_id] = future
+            self._send(json.dumps([self._next_id, test_file]))
+        data = json.loads(future.result())
+        if "error" in data:
+            raise Exception(data["error"])
+        if "timeout" in data:
+            report = timeout_report(self.folder, test_file, data["timeout"])
+        else:
+            report = TestReport.model_validate(data, strict=False)
+        if report_file:
+            _save_report(report, os.path.join(self.folder, report_file))
+        return report
+
+    def _send(self, line: str):
+        assert self._proc.stdin
+        self._proc.stdin.write(line.encode("utf-8") + b"\n")
+        self._proc.stdin.flush()
+
+    def _read_loop(self):
+        stdout = self._proc.stdout
+        assert stdout
+        try:
+            for line in stdout:
+                request_id, data = json.loads(line)
+                with self._lock:
+                    future = self._pending.pop(request_id)
+                future.set_result(data)
+        finally:
+            with self._lock:
+                for future in self._pending.values():
+                    future.set_exception(ConnectionError(f"pytest zygote process exited, with code {self._proc.poll()}"))
+                self._pending.clear()
+
+    def close(self):
+        with self._lock:
+            try:
+                self._send("")
+            except OSError:
+                pass
+        try:
+            self._proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self._proc.kill()
+
+    def __enter__(self)->'PytestWorkers':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+_workers: Dict[str, PytestWorkers] = {}
+
+class workers:
+    """
+    Context manager running `PytestWorkers` for the folder. Within it, `run()` on the same folder uses the workers.
+    """
+    def __init__(self, folder: str, preload: Optional[List[str]] = None, timeout: float = DEFAULT_TIMEOUT) -> None:
+        self._folder = os.path.abspath(folder)
+        self._preload = preload
+        self._timeout = timeout
+        self._pool: Optional[PytestWorkers] = None
+
+    def __enter__(self)->Optional[PytestWorkers]:
+        try:
+            self._pool = _workers[self._folder] = PytestWorkers(self._folder, self._preload, self._timeout)
+        except Exception as ex:
+            logger.warning(f"Failed to start the pytest workers, using the pytest CLI: {ex}")
+        return self._pool
+
+    def __exit__(self, *args):
+        if self._pool:
+            _workers.pop(self._folder, None)
+            self._pool.close()
 
 def configure(folder:str):
     """adds the test function docstring to the output report"""
@@ -0,0 +1,115 @@
+"""
+The pre-warmed pytest process of `toolguard.utils.pytest.PytestWorkers`.
+
+Runs as a script: `python pytest_zygote.py <folder> <timeout> [preload modules...]`,
+so starting it imports pytest and the preloaded modules only, not the `toolguard` package and its dependencies.
+Requests are read from stdin, and responses written to stdout, one json list per line:
+`[request id, test file]` and `[request id, json report]`. An empty line stops the process.
+"""
+import os
+import sys
+
+# not `toolguard/utils`, where `pytest.py` would shadow pytest
+_script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path[:] = [p for p in sys.path if os.path.abspath(p or ".") != _script_dir]
+
+import contextlib
+import gc
+import importlib
+import json
+import selectors
+import signal
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+PYTEST_ARGS = ["--quiet", "--json-report-file=none"]
+
+def main(folder: str, timeout: float, preload: List[str]):
+    """
+    Imports pytest, its plugins and the preloaded modules, then forks a child per test run,
+    that runs pytest in-process and writes back the json report. A child running longer than `timeout` seconds is killed.
+    It stays single threaded, so forking is safe.
+    """
+    # stdout is the responses channel. pytest output goes to stderr
+    responses = os.fdopen(os.dup(sys.stdout.fileno()), "w")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    import pytest
+    from pytest_jsonreport.plugin import JSONReport
+    os.chdir(folder)
+    sys.path.insert(0, folder) # as `PYTHONPATH=.`
+    for module in preload:
+        try:
+            importlib.import_module(module)
+        except Exception as ex:
+            print(f"Failed to preload '{module}': {ex}", file=sys.stderr)
+    with tempfile.TemporaryDirectory() as empty_dir: # the first session loads the installed plugins
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            pytest.main(["--collect-only", empty_dir] + PYTEST_ARGS, plugins=[JSONReport()])
+    # pytest runs full garbage collections at the end of a session. Frozen objects are skipped, and their pages stay shared with the children
+    gc.freeze()
+
+    def respond(request_id: int, data: str):
+        responses.write(json.dumps([request_id, data]) + "\n")
+        responses.flush()
+
+    stdin_fd = sys.stdin.fileno()
+    pending = b"" # read from stdin, not a complete line yet. Read unbuffered, as buffered lines are invisible to the selector
+    selector = selectors.DefaultSelector()
+    selector.register(stdin_fd, selectors.EVENT_READ)
+    running: Dict[int, Tuple[int, int, float, List[bytes]]] = {} # read fd -> (request id, child pid, deadline, report chunks)
+    while True:
+        deadline = min([run[2] for run in running.values()], default=None)
+        for key, _ in selector.select(None if deadline is None else max(0.0, deadline - time.monotonic())):
+            if key.fd == stdin_fd:
+                chunk = os.read(stdin_fd, 1 << 16)
+                if not chunk:
+                    return
+                pending += chunk
+                while b"\n" in pending:
+                    line, pending = pending.split(b"\n", 1)
+                    if not line.strip():
+                        return
+                    request_id, test_file = json.loads(line)
+                    read_fd, write_fd = os.pipe()
+                    pid = os.fork()
+                    if pid == 0: # child
+                        os.close(read_fd)
+                        try:
+                            plugin = JSONReport()
+                            pytest.main([test_file] + PYTEST_ARGS, plugins=[plugin])
+                            data = json.dumps(plugin.report)
+                        except BaseException as ex:
+                            data = json.dumps({"error": f"{type(ex).__name__}: {ex}"})
+                        with os.fdopen(write_fd, "w") as f:
+                            f.write(data)
+                        os._exit(0)
+                    os.close(write_fd)
+                    running[read_fd] = (request_id, pid, time.monotonic() + timeout, [])
+                    selector.register(read_fd, selectors.EVENT_READ)
+            else:
+                read_fd = key.fd
+                request_id, pid, _, chunks = running[read_fd]
+                chunk = os.read(read_fd, 1 << 16)
+                if chunk:
+                    chunks.append(chunk)
+                    continue
+                selector.unregister(read_fd)
+                os.close(read_fd)
+                os.waitpid(pid, 0)
+                del running[read_fd]
+                respond(request_id, b"".join(chunks).decode("utf-8"))
+
+        now = time.monotonic()
+        for read_fd, (request_id, pid, deadline, _) in list(running.items()):
+            if deadline <= now:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+                selector.unregister(read_fd)
+                os.close(read_fd)
+                del running[read_fd]
+                respond(request_id, json.dumps({"timeout": timeout}))
+
+if __name__ == '__main__':
+    main(sys.argv[1], float(sys.argv[2]), sys.argv[3:])
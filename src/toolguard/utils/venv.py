@@ -1,10 +1,29 @@
+import hashlib
+import json
+import logging
 import os
+import platform
+import shutil
 import subprocess
+import sys
 import venv
-# import sys
+from typing import List, Optional
 # import ensurepip
 
+logger = logging.getLogger(__name__)
+
+CACHE_DIR_ENV = "TOOLGUARD_VENV_CACHE"
+WHEELHOUSE_ENV = "TOOLGUARD_WHEELHOUSE"
+READY_MARKER = ".toolguard_venv.json"
+
 def run(venv_dir: str, packages: list[str]):
+    """
+    Makes `venv_dir` a virtual environment with the given packages.
+
+    Environments are cached once per machine, in `$TOOLGUARD_VENV_CACHE` (default `~/.cache/toolguard/venvs`),
+    keyed by the package list and the Python version. `venv_dir` is a symbolic link to the cached environment.
+    When `$TOOLGUARD_WHEELHOUSE` is set, packages are installed from that folder only, without network access.
+    """
     # Bootstrap pip if not present
     # try:
     #     import pip
@@ -13,10 +32,94 @@ def run(venv_dir: str, packages: list[str]):
 
     # subprocess.run([sys.executable, "-m", "pip", "install"] + packages, check=True)
 
+    key = venv_key(packages)
+    cached_dir = os.path.join(cache_dir(), key)
+    if not _is_ready(cached_dir, key):
+        _create(cached_dir, key, packages)
+
+    if os.path.islink(venv_dir):
+        if os.path.realpath(venv_dir) == os.path.realpath(cached_dir):
+            return
+        os.remove(venv_dir)
+    elif os.path.isdir(venv_dir):
+        if _is_ready(venv_dir, key):
+            return
+        shutil.rmtree(venv_dir)
+    os.makedirs(os.path.dirname(os.path.abspath(venv_dir)), exist_ok=True)
+    os.symlink(cached_dir, venv_dir, target_is_directory=True)
+
+def venv_key(packages: List[str])->str:
+    """Content address of an environment: the sorted package list, the Python version and the platform."""
+    desc = {
+        "packages": sorted(packages),
+        "python": [platform.python_implementation(), *[str(v) for v in sys.version_info[:3]]],
+        "platform": [sys.platform, platform.machine()],
+    }
+    return hashlib.sha256(json.dumps(desc, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+def cache_dir()->str:
+    return os.getenv(CACHE_DIR_ENV) or os.path.join(os.path.expanduser("~"), ".cache", "toolguard", "venvs")
+
+def download_wheelhouse(wheelhouse_dir: str, packages: List[str]):
+    """Downloads the packages and their dependencies, for offline installation with `$TOOLGUARD_WHEELHOUSE`."""
+    subprocess.run([sys.executable, "-m", "pip", "download", "--dest", wheelhouse_dir] + packages, check=True)
+
+def _is_ready(venv_dir: str, key: str)->bool:
+    try:
+        with open(os.path.join(venv_dir, READY_MARKER), "r") as f:
+            return json.load(f).get("key") == key
+    except (OSError, ValueError):
+        return False
+
+def _create(venv_dir: str, key: str, packages: List[str]):
+    # Built in a temporary folder and renamed, so concurrent runs never see a partial environment.
+    # Venvs hold absolute paths, so the temporary path is rewritten to the final one before the rename
+    tmp_dir = f"{venv_dir}.tmp{os.getpid()}"
+    os.makedirs(os.path.dirname(venv_dir), exist_ok=True)
+    logger.info(f"Creating the python environment {venv_dir} with {packages}")
 
     # Create the virtual environment
-    venv.create(venv_dir, with_pip=True)
+    venv.create(tmp_dir, with_pip=True)
     #
     # #install packages
-    pip_executable = os.path.join(venv_dir, "bin", "pip")
-    subprocess.run([pip_executable, "install"] + packages, check=True)
\ No newline at end of file
+    pip_executable = os.path.join(tmp_dir, "bin", "pip")
+    subprocess.run([pip_executable, "install", *_wheelhouse_args()] + packages, check=True)
+    with open(os.path.join(tmp_dir, READY_MARKER), "w") as f:
+        json.dump({"key": key, "packages": sorted(packages)}, f)
+    _fix_paths(tmp_dir, venv_dir)
+    if os.path.lexists(venv_dir) and not _is_ready(venv_dir, key):
+        # left by an interrupted or older run, or not a venv
+        logger.warning(f"Replacing the incomplete python environment {venv_dir}")
+        _remove(venv_dir)
+    try:
+        os.rename(tmp_dir, venv_dir)
+    except OSError: # created meanwhile by another process
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        if not _is_ready(venv_dir, key):
+            raise
+
+def _remove(path: str):
+    if os.path.isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+def _wheelhouse_args()->List[str]:
+    wheelhouse: Optional[str] = os.getenv(WHEELHOUSE_ENV)
+    return ["--no-index", "--find-links", wheelhouse] if wheelhouse else []
+
+def _fix_paths(tmp_dir: str, venv_dir: str):
+    # Scripts shebangs and activation scripts refer to the temporary folder
+    bin_dir = os.path.join(tmp_dir, "bin")
+    for file_name in os.listdir(bin_dir):
+        path = os.path.join(bin_dir, file_name)
+        if os.path.islink(path) or not os.path.isfile(path):
+            continue
+        with open(path, "rb") as f:
+            content = f.read()
+        if tmp_dir.encode() in content:
+            with open(path, "wb") as f:
+                f.write(content.replace(tmp_dir.encode(), venv_dir.encode()))
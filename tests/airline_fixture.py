@@ -0,0 +1,198 @@
+"""
+Synthetic airline guards tree, used by the runtime benchmarks.
+
+Mirrors the step2 output layout for the tau2 airline domain (domain files, `rt_toolguard`,
+one guard module per tool and one module per policy item), without calling an LLM.
+Tool signatures follow tau2 `AirlineTools`, and policy item names are taken from
+the step1 oracle in `eval/airline/tau2/step1__oracle`.
+"""
+import glob
+import inspect
+import json
+import os
+import re
+from os.path import join
+from typing import Any, Callable, Dict, List, Literal, Type, TypeVar
+
+from pydantic import BaseModel
+
+from toolguard.common.py import py_extension
+from toolguard.common.str import to_snake_case
+from toolguard.data_types import FileTwin, RuntimeDomain, ToolPolicy, ToolPolicyItem
+from toolguard.gen_py.consts import guard_fn_module_name, guard_fn_name, guard_item_fn_module_name, guard_item_fn_name
+from toolguard.gen_py.domain_from_funcs import generate_domain_from_functions
+from toolguard.gen_py.templates import load_template
+from toolguard.runtime import IToolInvoker, ToolGuardCodeResult, ToolGuardsCodeGenerationResult
+
+T = TypeVar("T")
+
+APP_NAME = "airline"
+ORACLE_DIR = join(os.path.dirname(__file__), "..", "eval", "airline", "tau2", "step1__oracle")
+
+class Passenger(BaseModel):
+    first_name: str
+    last_name: str
+    dob: str
+
+class FlightInfo(BaseModel):
+    flight_number: str
+    date: str
+
+class Payment(BaseModel):
+    payment_id: str
+    amount: int
+
+class User(BaseModel):
+    user_id: str
+    membership: Literal["gold", "silver", "regular"]
+    payment_methods: List[Payment]
+
+class Reservation(BaseModel):
+    reservation_id: str
+    user_id: str
+    cabin: Literal["basic_economy", "economy", "business"]
+    flights: List[FlightInfo]
+    passengers: List[Passenger]
+
+def book_reservation(user_id: str, origin: str, destination: str, flight_type: Literal["round_trip", "one_way"], cabin: Literal["basic_economy", "economy", "business"], flights: List[FlightInfo], passengers: List[Passenger], payment_methods: List[Payment], total_baggages: int, nonfree_baggages: int, insurance: Literal["yes", "no"]) -> Reservation:
+    """Book a reservation."""
+    ...
+
+def cancel_reservation(reservation_id: str) -> Reservation:
+    """Cancel the whole reservation."""
+    ...
+
+def update_reservation_baggages(reservation_id: str, total_baggages: int, nonfree_baggages: int, payment_id: str) -> Reservation:
+    """Update the baggage information of a reservation."""
+    ...
+
+def update_reservation_flights(reservation_id: str, cabin: Literal["basic_economy", "economy", "business"], flights: List[FlightInfo], payment_id: str) -> Reservation:
+    """Update the flight information of a reservation."""
+    ...
+
+def update_reservation_passengers(reservation_id: str, passengers: List[Passenger]) -> Reservation:
+    """Update the passenger information of a reservation."""
+    ...
+
+def get_user_details(user_id: str) -> User:
+    """Get the details of a user, including their reservations."""
+    ...
+
+def get_reservation_details(reservation_id: str) -> Reservation:
+    """Get the details of a reservation."""
+    ...
+
+GUARDED_TOOLS = [book_reservation, cancel_reservation, update_reservation_baggages, update_reservation_flights, update_reservation_passengers]
+TOOLS = GUARDED_TOOLS + [get_user_details, get_reservation_details]
+
+SAMPLE_CALLS = {
+    "book_reservation": {
+        "user_id": "mia_li_3668", "origin": "JFK", "destination": "SEA", "flight_type": "one_way", "cabin": "economy",
+        "flights": [{"flight_number": "HAT136", "date": "2024-05-20"}, {"flight_number": "HAT039", "date": "2024-05-20"}],
+        "passengers": [{"first_name": "Mia", "last_name": "Li", "dob": "1990-04-05"}],
+        "payment_methods": [{"payment_id": "certificate_7504069", "amount": 250}],
+        "total_baggages": 3, "nonfree_baggages": 0, "insurance": "no"
+    },
+    "cancel_reservation": {"reservation_id": "Q69X3R"},
+    "update_reservation_baggages": {"reservation_id": "Q69X3R", "total_baggages": 2, "nonfree_baggages": 1, "payment_id": "credit_card_4421486"},
+    "update_reservation_flights": {
+        "reservation_id": "Q69X3R", "cabin": "economy",
+        "flights": [{"flight_number": "HAT136", "date": "2024-05-22"}],
+        "payment_id": "credit_card_4421486"
+    },
+    "update_reservation_passengers": {
+        "reservation_id": "Q69X3R",
+        "passengers": [{"first_name": "Mia", "last_name": "Li", "dob": "1990-04-05"}]
+    },
+}
+
+def load_oracle_policy(tool_name: str)->ToolPolicy:
+    with open(join(ORACLE_DIR, f"{tool_name}.json"), "r") as file:
+        d = json.load(file)
+    items = [ToolPolicyItem(
+                name=item["policy_name"],
+                description=item["description"],
+                references=item.get("references", []),
+                compliance_examples=item.get("compliance_examples"),
+                violation_examples=item.get("violating_examples")
+            )
+            for item in d["policies"]]
+    return ToolPolicy(tool_name=tool_name, policy_items=items)
+
+def _signature_str(func)->str:
+    sig_str = str(inspect.signature(func))
+    sig_str = sig_str[1: sig_str.rfind(")")].strip()
+    return re.sub(r'\b(?:\w+\.)+(\w+)', r'\1', sig_str)
+
+def build_airline_guards(py_root: str, replicas: int = 1)->ToolGuardsCodeGenerationResult:
+    """
+    Writes a complete guards tree into `py_root`, and returns the corresponding `result.json` model.
+    With `replicas` > 1, the guarded tools are duplicated (eg: `book_reservation_2`) to simulate a large tool catalog.
+    """
+    domain = generate_domain_from_functions(py_root, APP_NAME, TOOLS, [__name__.split(".")[0]])
+    tools = {}
+    for i in range(replicas):
+        for func in GUARDED_TOOLS:
+            policy = load_oracle_policy(func.__name__)
+            if i > 0:
+                policy.tool_name = f"{policy.tool_name}_{i+1}"
+            tools[policy.tool_name] = _build_tool_guard(py_root, domain, policy, func)
+    return ToolGuardsCodeGenerationResult(domain=domain, tools=tools).save(py_root)
+
+def _build_tool_guard(py_root: str, domain: RuntimeDomain, policy: ToolPolicy, func: Callable)->ToolGuardCodeResult:
+    tool_dir = join(to_snake_case(APP_NAME), to_snake_case(policy.tool_name))
+    FileTwin(file_name=join(tool_dir, "__init__.py"), content="").save(py_root)
+    sig_str = _signature_str(func)
+
+    item_files = [FileTwin(
+            file_name=join(tool_dir, py_extension(guard_item_fn_module_name(item))),
+            content=load_template("tool_item_guard.j2").render(
+                domain=domain,
+                method={"name": guard_item_fn_name(item), "signature": sig_str, "args_doc_str": ""},
+                policy=item.description,
+                extra_imports=[]
+            )
+        ).save(py_root)
+        for item in policy.policy_items]
+
+    items = [{"guard_fn": guard_item_fn_name(item), "file_name": file.file_name}
+        for item, file in zip(policy.policy_items, item_files)]
+    guard_file = FileTwin(
+        file_name=join(tool_dir, py_extension(guard_fn_module_name(policy))),
+        content=load_template("tool_guard.j2").render(
+            domain=domain,
+            method={
+                "name": guard_fn_name(policy),
+                "signature": sig_str,
+                "args_call": ", ".join(inspect.signature(func).parameters),
+                "args_doc_str": ""
+            },
+            items=items,
+            extra_imports=[]
+        )
+    ).save(py_root)
+
+    return ToolGuardCodeResult(
+        tool=policy,
+        guard_fn_name=guard_fn_name(policy),
+        guard_file=guard_file,
+        item_guard_files=item_files,
+        test_files=[None]*len(item_files)
+    )
+
+BLOCKED_USER = "blocked_user"
+
+class UsersInvoker(IToolInvoker):
+    def invoke(self, toolname: str, arguments: Dict[str, Any], model: Type[T])->T:
+        return None if arguments.get("user_id") == BLOCKED_USER else {"user_id": arguments.get("user_id")} # type: ignore
+
+def add_user_check(guards_dir: str):
+    """Makes one policy item of `book_reservation` look up the user, and reject blocked users."""
+    item_file = sorted(glob.glob(os.path.join(guards_dir, "airline", "book_reservation", "guard_*.py")))
+    item_file = [f for f in item_file if not f.endswith("guard_book_reservation.py")][0]
+    with open(item_file, "r") as f:
+        content = f.read()
+    content = content.replace("pass #FIXME",
+        "if api.get_user_details(user_id) is None:\n        raise PolicyViolationException('user not found')", 1)
+    with open(item_file, "w") as f:
+        f.write(content)
@@ -0,0 +1,86 @@
+"""
+Benchmark of type checking the airline guard files with the pyright CLI (a process per file),
+and with a long-lived pyright language server.
+Every file is checked by both, and their diagnostics are compared.
+Then a module imported by a checked file is rewritten on disk, and the file is checked again by both.
+
+Requires `pyright` (eg: `pip install pyright`).
+
+Usage:
+    PYTHONPATH=src python tests/bench_pyright.py [--files 20]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import toolguard.utils.pyright as pyright
+
+from airline_fixture import build_airline_guards
+
+VENV = "my_env"
+BROKEN_GUARD = """
+from airline.airline_types import *
+
+def guard_broken(api, reservation_id: str):
+    res = api.get_reservation_details(reservation_id)
+    return res.no_such_field + undefined_name
+"""
+IMPORTED = "def f()->{}:\n    return {}\n"
+IMPORTER = "from bench_imported import f\nx: int = f()\n"
+
+def main():
+    parser = argparse.ArgumentParser(description='pyright CLI vs pyright server')
+    parser.add_argument('--files', type=int, default=20, help='Number of files to check')
+    args = parser.parse_args()
+
+    py_root = tempfile.mkdtemp(prefix="tg_bench_")
+    result = build_airline_guards(py_root)
+    pyright.config(py_root)
+    # the guards environment is the current interpreter
+    os.makedirs(os.path.join(py_root, VENV, "bin"))
+    os.symlink(sys.executable, os.path.join(py_root, VENV, "bin", "python3"))
+    with open(os.path.join(py_root, "airline", "guard_broken.py"), "w") as f:
+        f.write(BROKEN_GUARD)
+
+    files = ["airline/guard_broken.py"]
+    for tool in result.tools.values():
+        files.extend([tool.guard_file.file_name] + [item.file_name for item in tool.item_guard_files if item])
+    files = (files * (args.files // len(files) + 1))[:args.files]
+
+    start = time.perf_counter()
+    cli_reports = [pyright.run_subprocess(py_root, file, VENV) for file in files]
+    cli_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with pyright.PyrightServer(py_root, VENV) as server:
+        startup = time.perf_counter() - start
+        server_reports = [server.check(file) for file in files]
+        server_time = time.perf_counter() - start
+        stale_import = check_rewritten_import(py_root, server)
+
+    mismatches = [file for file, cli, srv in zip(files, cli_reports, server_reports)
+        if (cli.summary.errorCount, cli.summary.warningCount) != (srv.summary.errorCount, srv.summary.warningCount)]
+    print(f"{len(files)} files, {sum([r.summary.errorCount for r in cli_reports])} errors")
+    print(f"pyright CLI:    {cli_time:7.2f}s  ({cli_time / len(files) * 1000:.0f}ms per file)")
+    print(f"pyright server: {server_time:7.2f}s  ({(server_time - startup) / len(files) * 1000:.0f}ms per file, {startup * 1000:.0f}ms startup)")
+    print(f"files with different error or warning counts: {mismatches}")
+    print(f"after rewriting an imported module, errors (CLI, server): {stale_import}")
+    if mismatches or stale_import[0] != stale_import[1]:
+        sys.exit(1)
+
+def check_rewritten_import(py_root: str, server: pyright.PyrightServer):
+    """The server must not keep the analysis of an imported module that changed on disk."""
+    with open(os.path.join(py_root, "bench_imported.py"), "w") as f:
+        f.write(IMPORTED.format("int", "1"))
+    with open(os.path.join(py_root, "bench_importer.py"), "w") as f:
+        f.write(IMPORTER)
+    server.check("bench_importer.py")
+    with open(os.path.join(py_root, "bench_imported.py"), "w") as f:
+        f.write(IMPORTED.format("str", "''"))
+    return (pyright.run_subprocess(py_root, "bench_importer.py", VENV).summary.errorCount,
+        server.check("bench_importer.py").summary.errorCount)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark of running generated guard tests with the pytest CLI (a process per run),
+and with pre-warmed in-process pytest workers.
+Every run is done by both, and their outcomes are compared.
+
+Requires `pytest-json-report`.
+
+Usage:
+    PYTHONPATH=src python tests/bench_pytest.py [--runs 20]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from toolguard.common.py import path_to_module
+from toolguard.gen_py.consts import RUNTIME_PACKAGE_NAME
+import toolguard.utils.pytest as pytest
+
+from airline_fixture import APP_NAME, build_airline_guards
+
+TEST_FILE = "tests/test_guard_cancel_reservation.py"
+TEST_CONTENT = f"""
+import pytest
+from unittest.mock import MagicMock
+from {APP_NAME}.{APP_NAME}_types import *
+from {APP_NAME}.i_{APP_NAME} import I_{APP_NAME.capitalize()}
+from {APP_NAME}.cancel_reservation.guard_cancel_reservation import guard_cancel_reservation
+
+def test_compliance():
+    \"\"\"Cancelling an existing reservation\"\"\"
+    api = MagicMock(spec=I_{APP_NAME.capitalize()})
+    guard_cancel_reservation(api, reservation_id="Q69X3R")
+
+def test_violation():
+    \"\"\"Cancelling must be rejected\"\"\"
+    api = MagicMock(spec=I_{APP_NAME.capitalize()})
+    with pytest.raises(Exception):
+        guard_cancel_reservation(api, reservation_id="Q69X3R")
+"""
+
+def main():
+    parser = argparse.ArgumentParser(description='pytest CLI vs in-process pytest workers')
+    parser.add_argument('--runs', type=int, default=20, help='Number of test runs')
+    args = parser.parse_args()
+
+    py_root = tempfile.mkdtemp(prefix="tg_bench_")
+    result = build_airline_guards(py_root)
+    pytest.configure(py_root)
+    os.makedirs(os.path.join(py_root, "tests"))
+    with open(os.path.join(py_root, TEST_FILE), "w") as f:
+        f.write(TEST_CONTENT)
+    report_file = "tests/report.json"
+
+    start = time.perf_counter()
+    cli_reports = [pytest.run_subprocess(py_root, TEST_FILE, report_file) for _ in range(args.runs)]
+    cli_time = time.perf_counter() - start
+
+    domain = [result.domain.app_types.file_name, result.domain.app_api.file_name]
+    start = time.perf_counter()
+    preload = [RUNTIME_PACKAGE_NAME] + [path_to_module(file) for file in domain]
+    with pytest.PytestWorkers(py_root, preload) as workers:
+        worker_reports = [workers.run(TEST_FILE, report_file)] # waits for the pre-warmed process
+        startup = time.perf_counter() - start
+        start = time.perf_counter()
+        worker_reports += [workers.run(TEST_FILE, report_file) for _ in range(args.runs - 1)]
+    worker_time = time.perf_counter() - start
+
+    same = all([cli.list_errors() == srv.list_errors() and cli.summary.total == srv.summary.total
+        for cli, srv in zip(cli_reports, worker_reports)])
+    print(f"{args.runs} runs of {cli_reports[0].summary.total} tests, errors: {cli_reports[0].list_errors()}")
+    print(f"pytest CLI:     {cli_time:6.2f}s  ({cli_time / args.runs * 1000:.0f}ms per run)")
+    print(f"pytest workers: {startup + worker_time:6.2f}s  ({worker_time / (args.runs - 1) * 1000:.0f}ms per run, {startup * 1000:.0f}ms startup and first run)")
+    print(f"same outcomes: {same}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Micro-benchmark of the per-call overhead of `ToolguardRuntime.check_toolcall` on the airline guards.
+
+Usage:
+    PYTHONPATH=src python tests/bench_runtime.py [--calls 2000] [--guards-dir <step2 output folder>]
+
+Without `--guards-dir`, a synthetic airline guards tree is generated into a temporary folder (see `airline_fixture.py`).
+"""
+import argparse
+import inspect
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, Type, TypeVar
+
+from pydantic import BaseModel
+
+from toolguard.data_types import API_PARAM
+from toolguard.runtime import IToolInvoker, ToolguardRuntime, load_toolguards
+
+from airline_fixture import SAMPLE_CALLS, build_airline_guards
+
+T = TypeVar("T")
+class NullInvoker(IToolInvoker):
+    def invoke(self, toolname: str, arguments: Dict[str, Any], model: Type[T])->T:
+        return None  # type: ignore
+
+def legacy_make_args(guard_fn: Callable, args: dict, api: Any)->Dict[str, Any]:
+    """Argument binding as done before call plans: reflection and `model_construct` on every call."""
+    sig = inspect.signature(guard_fn)
+    guard_args = {}
+    for p_name, param in sig.parameters.items():
+        if p_name == API_PARAM:
+            guard_args[p_name] = api
+        else:
+            arg = args.get(p_name)
+            if inspect.isclass(param.annotation) and issubclass(param.annotation, BaseModel):
+                guard_args[p_name] = param.annotation.model_construct(arg)
+            else:
+                guard_args[p_name] = arg
+    return guard_args
+
+def per_call_us(fn: Callable[[], Any], calls: int)->float:
+    fn() #warm up
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls * 1e6
+
+def bench(runtime: ToolguardRuntime, calls: int):
+    invoker = NullInvoker()
+    print(f"{'tool':32}{'legacy bind (us)':>18}{'dict bind (us)':>16}{'model bind (us)':>17}{'check_toolcall (us)':>21}")
+    for tool_name, args in SAMPLE_CALLS.items():
+        plan = runtime._plan(tool_name)
+        if plan is None:
+            continue
+        api = object()
+        bound_args = plan.make_args(args, api) # arguments already converted to the domain types: the fast path
+        legacy = per_call_us(lambda: legacy_make_args(plan.guard_fn, args, api), calls)
+        planned = per_call_us(lambda: plan.make_args(args, api), calls)
+        prebound = per_call_us(lambda: plan.make_args(bound_args, api), calls)
+        full = per_call_us(lambda: runtime.check_toolcall(tool_name, args, invoker), calls)
+        print(f"{tool_name:32}{legacy:>18.2f}{planned:>16.2f}{prebound:>17.2f}{full:>21.2f}")
+    print(f"module loads: {runtime.module_loads}")
+
+def main():
+    parser = argparse.ArgumentParser(description='ToolguardRuntime per-call overhead')
+    parser.add_argument('--calls', type=int, default=2000, help='Number of calls per tool')
+    parser.add_argument('--guards-dir', type=str, default=None, help='step2 output folder. A synthetic airline tree is generated if omitted.')
+    args = parser.parse_args()
+
+    guards_dir = args.guards_dir
+    if not guards_dir:
+        guards_dir = tempfile.mkdtemp(prefix="tg_bench_")
+        build_airline_guards(guards_dir)
+    sys.path.insert(0, os.path.abspath(guards_dir))
+    bench(load_toolguards(guards_dir), args.calls)
+
+if __name__ == '__main__':
+    main()
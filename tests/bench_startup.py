@@ -0,0 +1,68 @@
+"""
+Cold-start benchmark of loading the airline guards, from a step2 folder and from a bundle (see `toolguard bundle`).
+Each measurement runs in a fresh python process, and covers importing `rt_toolguard` and `load_toolguards`.
+The `folder (result.json)` rows load a copy of the folder without the runtime manifest.
+With `--source-kb`, every guard file is padded, as generated guards, tests and domain files are embedded in `result.json`.
+
+Usage:
+    PYTHONPATH=src python tests/bench_startup.py [--replicas 20] [--runs 5] [--source-kb 0]
+"""
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from toolguard.data_types import RUNTIME_MANIFEST_FILENAME
+from toolguard.gen_py.bundle import bundle_toolguards
+
+from airline_fixture import build_airline_guards
+
+SNIPPET = """
+import sys, time
+path, lazy = sys.argv[1], sys.argv[2] == "lazy"
+sys.path.insert(0, path)
+start = time.perf_counter()
+from rt_toolguard import load_toolguards
+load_toolguards(path, lazy=lazy)
+print(time.perf_counter() - start)
+"""
+
+def cold_start_ms(path: str, lazy: bool, runs: int)->float:
+    times = []
+    for _ in range(runs):
+        res = subprocess.run([sys.executable, "-c", SNIPPET, path, "lazy" if lazy else "eager"],
+            capture_output=True, text=True, check=True, env={**os.environ, "PYTHONPATH": ""})
+        times.append(float(res.stdout.strip()) * 1000)
+    return statistics.median(times)
+
+def main():
+    parser = argparse.ArgumentParser(description='Guards cold-start benchmark')
+    parser.add_argument('--replicas', type=int, default=20, help='Number of copies of the airline guarded tools')
+    parser.add_argument('--runs', type=int, default=5, help='Number of processes per measurement. The median is reported')
+    parser.add_argument('--source-kb', type=int, default=0, help='Padding added to the source of each guard file, in KB')
+    args = parser.parse_args()
+
+    guards_dir = tempfile.mkdtemp(prefix="tg_bench_")
+    result = build_airline_guards(guards_dir, args.replicas)
+    if args.source_kb:
+        padding = "#" + "x" * 1023 + "\n"
+        for tool in result.tools.values():
+            for file in [tool.guard_file] + tool.item_guard_files:
+                file.content += padding * args.source_kb # type: ignore
+                file.save(guards_dir) # type: ignore
+        result.save(guards_dir)
+    bundle = bundle_toolguards(guards_dir, guards_dir + ".zip")
+    results_only_dir = guards_dir + "_results_only"
+    shutil.copytree(guards_dir, results_only_dir)
+    os.remove(os.path.join(results_only_dir, RUNTIME_MANIFEST_FILENAME))
+    print(f"{len(result.tools)} tools, result.json: {os.path.getsize(os.path.join(guards_dir, 'result.json')) // 1024}KB")
+    print(f"{'source':22}{'mode':8}{'startup (ms)':>14}")
+    for source, path in [("folder", guards_dir), ("folder (result.json)", results_only_dir), ("bundle", bundle)]:
+        for lazy in [False, True]:
+            print(f"{source:22}{'lazy' if lazy else 'eager':8}{cold_start_ms(path, lazy, args.runs):>14.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,21 @@
+import os
+import sys
+
+import pytest
+
+# litellm fetches its model cost map at import, unless told to use its local copy
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+
+from airline_fixture import add_user_check, build_airline_guards
+
+@pytest.fixture(scope="session")
+def airline_guards(tmp_path_factory)->str:
+    """
+    The airline guards tree, where `book_reservation` looks up the user (see `add_user_check`).
+    Shared by the session, as its modules are imported by name.
+    """
+    guards_dir = str(tmp_path_factory.mktemp("airline_guards"))
+    build_airline_guards(guards_dir)
+    add_user_check(guards_dir)
+    sys.path.insert(0, guards_dir)
+    return guards_dir
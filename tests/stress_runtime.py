@@ -0,0 +1,115 @@
+"""
+Stress test of a `ToolguardRuntime` shared by many threads, and by forked worker processes.
+
+Many threads call `check_toolcall` at once on a lazy runtime, so the first calls race on loading the guards.
+Each guard module must be executed once, and every call must report the expected outcome.
+Then the runtime is preloaded and the process forks workers (as gunicorn `preload_app` does),
+which check tool calls with concurrent item guards, and must not load any module.
+
+Usage:
+    PYTHONPATH=src python tests/stress_runtime.py [--threads 32] [--calls 200] [--workers 4]
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+from typing import List
+
+from toolguard.data_types import ItemGuardsExecution
+from toolguard.runtime import ToolguardRuntime, is_policy_violation, load_toolguards, modules_registry
+
+from airline_fixture import BLOCKED_USER, SAMPLE_CALLS, UsersInvoker, add_user_check, build_airline_guards
+
+def calls(n: int)->List[tuple]:
+    res = []
+    for i in range(n):
+        tool_name = list(SAMPLE_CALLS)[i % len(SAMPLE_CALLS)]
+        args = dict(SAMPLE_CALLS[tool_name])
+        if tool_name == "book_reservation" and i % 2:
+            args["user_id"] = BLOCKED_USER
+        res.append((tool_name, args))
+    return res
+
+def expected_violation(tool_name: str, args: dict)->bool:
+    return tool_name == "book_reservation" and args["user_id"] == BLOCKED_USER
+
+def check_all(runtime: ToolguardRuntime, tool_calls: List[tuple], errors: List[str]):
+    invoker = UsersInvoker()
+    for tool_name, args in tool_calls:
+        try:
+            runtime.check_toolcall(tool_name, args, invoker)
+            violation = False
+        except Exception as ex:
+            if not is_policy_violation(ex):
+                errors.append(f"{tool_name}: {type(ex).__name__}: {ex}")
+                continue
+            violation = True
+        if violation != expected_violation(tool_name, args):
+            errors.append(f"{tool_name}: unexpected outcome, violation={violation}")
+
+def stress_threads(guards_dir: str, threads: int, n_calls: int):
+    executions = modules_registry.executions
+    runtime = load_toolguards(guards_dir, lazy=True, item_guards_execution=ItemGuardsExecution.concurrent_all)
+    errors: List[str] = []
+    barrier = threading.Barrier(threads)
+    def worker():
+        barrier.wait()
+        check_all(runtime, calls(n_calls), errors)
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    executed = modules_registry.executions - executions
+    print(f"threads: {threads} x {n_calls} calls, {len(errors)} errors, {runtime.module_loads} module loads, {executed} module executions")
+    assert not errors, errors[:5]
+    assert executed == runtime.module_loads == len(SAMPLE_CALLS) + 1, "each guard module must be executed once"
+    return runtime
+
+def forked_worker(runtime: ToolguardRuntime, n_calls: int, queue):
+    errors: List[str] = []
+    executions = modules_registry.executions
+    threads = [threading.Thread(target=check_all, args=(runtime, calls(n_calls), errors)) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    queue.put((os.getpid(), errors, modules_registry.executions - executions))
+
+def stress_fork(runtime: ToolguardRuntime, workers: int, n_calls: int):
+    runtime.preload()
+    check_all(runtime, calls(len(SAMPLE_CALLS)), []) # starts the item guards pool in the parent
+    ctx = multiprocessing.get_context("fork")
+    queue = ctx.Queue()
+    procs = [ctx.Process(target=forked_worker, args=(runtime, n_calls, queue)) for _ in range(workers)]
+    for p in procs:
+        p.start()
+    results = [queue.get(timeout=60) for _ in procs]
+    for p in procs:
+        p.join()
+    for pid, errors, executed in results:
+        print(f"worker {pid}: {len(errors)} errors, {executed} module executions")
+        assert not errors, errors[:5]
+        assert executed == 0, "preloaded guards must not be loaded again"
+
+def main():
+    parser = argparse.ArgumentParser(description='ToolguardRuntime concurrency stress test')
+    parser.add_argument('--threads', type=int, default=32, help='Number of threads sharing the runtime')
+    parser.add_argument('--calls', type=int, default=200, help='Number of tool calls per thread')
+    parser.add_argument('--workers', type=int, default=4, help='Number of forked worker processes')
+    args = parser.parse_args()
+
+    guards_dir = tempfile.mkdtemp(prefix="tg_stress_")
+    build_airline_guards(guards_dir)
+    add_user_check(guards_dir)
+    sys.path.insert(0, os.path.abspath(guards_dir))
+
+    runtime = stress_threads(guards_dir, args.threads, args.calls)
+    if hasattr(os, "fork"):
+        stress_fork(runtime, args.workers, args.calls)
+    print("OK")
+
+if __name__ == '__main__':
+    main()
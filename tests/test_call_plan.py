@@ -0,0 +1,53 @@
+import pytest
+from pydantic import ValidationError
+
+from toolguard.runtime import ToolCallPlan, find_function_in_module, load_module_from_path, read_manifest
+
+import airline_fixture
+from airline_fixture import SAMPLE_CALLS
+
+def guard_plan(guards_dir: str, tool_name: str)->ToolCallPlan:
+    tool = read_manifest(guards_dir).tools[tool_name]
+    module = load_module_from_path(tool.guard_file, guards_dir)
+    return ToolCallPlan(find_function_in_module(module, tool.guard_fn_name))
+
+def test_dicts_are_bound_to_the_domain_types(airline_guards):
+    from airline.airline_types import FlightInfo, Passenger
+
+    plan = guard_plan(airline_guards, "book_reservation")
+    api = object()
+    args = plan.make_args(SAMPLE_CALLS["book_reservation"], api)
+
+    assert args["api"] is api
+    assert args["user_id"] == "mia_li_3668"
+    assert args["total_baggages"] == 3
+    assert [type(p) for p in args["passengers"]] == [Passenger]
+    assert args["passengers"][0].dob == "1990-04-05"
+    assert [f.flight_number for f in args["flights"]] == ["HAT136", "HAT039"]
+    assert all([type(f) is FlightInfo for f in args["flights"]])
+
+def test_app_models_are_converted_from_attributes(airline_guards):
+    from airline.airline_types import Passenger
+
+    plan = guard_plan(airline_guards, "update_reservation_passengers")
+    app_passenger = airline_fixture.Passenger(first_name="Mia", last_name="Li", dob="1990-04-05")
+    args = plan.make_args({"reservation_id": "Q69X3R", "passengers": [app_passenger]})
+
+    assert type(args["passengers"][0]) is Passenger
+    assert args["passengers"][0].model_dump() == app_passenger.model_dump()
+
+def test_domain_models_are_passed_as_is(airline_guards):
+    from airline.airline_types import Passenger
+
+    plan = guard_plan(airline_guards, "update_reservation_passengers")
+    passengers = [Passenger(first_name="Mia", last_name="Li", dob="1990-04-05")]
+    args = plan.make_args({"reservation_id": "Q69X3R", "passengers": passengers})
+
+    assert args["passengers"] is passengers
+
+def test_missing_and_invalid_arguments(airline_guards):
+    plan = guard_plan(airline_guards, "update_reservation_baggages")
+    assert plan.make_args({"reservation_id": "Q69X3R"})["payment_id"] is None
+
+    with pytest.raises(ValidationError):
+        plan.make_args({**SAMPLE_CALLS["update_reservation_baggages"], "total_baggages": "many"})
@@ -0,0 +1,61 @@
+import threading
+import time
+from typing import Any, Dict, Type
+
+from toolguard.runtime import BudgetExceededPolicy, IToolInvoker, ToolCallOutcome, load_toolguards
+
+from airline_fixture import BLOCKED_USER, SAMPLE_CALLS, UsersInvoker
+
+SLOW_USER = "slow_user"
+
+class CountingUsersInvoker(UsersInvoker):
+    """Counts the user lookups, and is slow to find `SLOW_USER`"""
+    def __init__(self) -> None:
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def invoke(self, toolname: str, arguments: Dict[str, Any], model: Type)->Any:
+        with self._lock:
+            self.calls += 1
+        if arguments.get("user_id") == SLOW_USER:
+            time.sleep(0.3)
+        return super().invoke(toolname, arguments, model)
+
+def booking(user_id: str)->dict:
+    return {**SAMPLE_CALLS["book_reservation"], "user_id": user_id}
+
+def test_results_are_in_the_calls_order(airline_guards):
+    runtime = load_toolguards(airline_guards)
+    calls = [("book_reservation", booking(BLOCKED_USER if i % 3 == 0 else f"user_{i}")) for i in range(20)]
+    calls.append(("get_user_details", {"user_id": BLOCKED_USER})) # not guarded
+    calls.append(("book_reservation", {**booking("user_x"), "total_baggages": "many"}))
+
+    results = list(runtime.check_batch(calls, CountingUsersInvoker(), max_workers=4))
+
+    assert [r.index for r in results] == list(range(len(calls)))
+    assert [r.tool_name for r in results] == [tool_name for tool_name, _ in calls]
+    expected = [ToolCallOutcome.violation if i % 3 == 0 else ToolCallOutcome.passed for i in range(20)]
+    assert [r.outcome for r in results] == expected + [ToolCallOutcome.passed, ToolCallOutcome.error]
+    assert results[0].message == "user not found"
+    assert results[-1].message.startswith("ValidationError")
+
+def test_read_only_results_are_shared_by_the_batch(airline_guards):
+    runtime = load_toolguards(airline_guards)
+    invoker = CountingUsersInvoker()
+    calls = [("book_reservation", booking(f"user_{i % 5}")) for i in range(40)]
+
+    results = list(runtime.check_batch(calls, invoker, max_workers=1, read_only_tools={"get_user_details"}))
+    assert all([r.outcome == ToolCallOutcome.passed for r in results])
+    assert invoker.calls == 5
+
+    invoker.calls = 0
+    list(runtime.check_batch(calls, invoker, max_workers=1))
+    assert invoker.calls == 40
+
+def test_timeout_is_an_error(airline_guards):
+    runtime = load_toolguards(airline_guards, time_budget=0.1, budget_exceeded=BudgetExceededPolicy.fail_closed)
+    calls = [("book_reservation", booking(SLOW_USER)), ("book_reservation", booking("user_1"))]
+
+    results = list(runtime.check_batch(calls, CountingUsersInvoker(), max_workers=2))
+    assert [r.outcome for r in results] == [ToolCallOutcome.error, ToolCallOutcome.passed]
+    assert results[0].message.startswith("GuardTimeoutException")
@@ -0,0 +1,60 @@
+import asyncio
+import os
+
+import pytest
+
+from toolguard.stages_tptd import text_tool_policy_generator
+from toolguard.stages_tptd.text_tool_policy_generator import CHECKPOINTS_DIR, TextToolPolicyGenerator, ToolInfo
+
+from airline_fixture import TOOLS
+
+POLICY = "Reservations can be booked for registered users only."
+TPTD = {"policies": [{"policy_name": "registered users"}]}
+
+class Stage:
+    """A stage that returns its run number"""
+    def __init__(self) -> None:
+        self.runs = 0
+
+    async def __call__(self)->dict:
+        self.runs += 1
+        return {"run": self.runs}
+
+def generator(out_dir: str, resume: bool = True, policy: str = POLICY)->TextToolPolicyGenerator:
+    return TextToolPolicyGenerator(None, policy, [ToolInfo.from_function(fn) for fn in TOOLS], out_dir, resume=resume) # type: ignore
+
+def run_stage(tpg: TextToolPolicyGenerator, stage: Stage, tptd: dict = TPTD)->dict:
+    return asyncio.run(tpg.run_stage("book_reservation", "example_creator", "create_examples", tptd, stage))
+
+def test_same_inputs_resume(tmp_path):
+    stage = Stage()
+    assert run_stage(generator(str(tmp_path)), stage) == {"run": 1}
+    assert run_stage(generator(str(tmp_path)), stage) == {"run": 1}
+    assert stage.runs == 1
+
+    assert run_stage(generator(str(tmp_path), resume=False), stage) == {"run": 2}
+
+@pytest.mark.parametrize("change", ["tptd", "policy", "prompt"])
+def test_changed_inputs_rerun(tmp_path, monkeypatch, change):
+    stage = Stage()
+    run_stage(generator(str(tmp_path)), stage)
+
+    tptd = {"policies": []} if change == "tptd" else TPTD
+    policy = POLICY + " Gold members fly free." if change == "policy" else POLICY
+    if change == "prompt":
+        read_prompt_file = text_tool_policy_generator.read_prompt_file
+        monkeypatch.setattr(text_tool_policy_generator, "read_prompt_file", lambda name: read_prompt_file(name) + "\nBe brief.")
+    assert run_stage(generator(str(tmp_path), policy=policy), stage, tptd) == {"run": 2}
+
+    monkeypatch.undo()
+    assert run_stage(generator(str(tmp_path)), stage) == {"run": 3} # the checkpoint was replaced
+
+def test_corrupt_checkpoint_is_ignored(tmp_path):
+    stage = Stage()
+    run_stage(generator(str(tmp_path)), stage)
+    path = os.path.join(str(tmp_path), CHECKPOINTS_DIR, "book_reservation_example_creator.json")
+    with open(path, "w") as f:
+        f.write('{"key": "')
+
+    assert run_stage(generator(str(tmp_path)), stage) == {"run": 2}
+    assert run_stage(generator(str(tmp_path)), stage) == {"run": 2}
@@ -0,0 +1,25 @@
+from toolguard.runtime import GuardedToolsProxy, ToolguardRuntime, read_manifest
+
+class AirlineTools:
+    region = "us"
+
+    def cancel_reservation(self, reservation_id: str):
+        return f"cancelled {reservation_id}"
+
+    def tools(self, reservation_id: str):
+        return f"tools {reservation_id}"
+
+    def _tools(self, reservation_id: str):
+        return f"_tools {reservation_id}"
+
+def test_tools_named_like_proxy_attributes(airline_guards):
+    manifest = read_manifest(airline_guards)
+    manifest.tools["tools"] = manifest.tools["_tools"] = manifest.tools["cancel_reservation"]
+    proxy = GuardedToolsProxy(AirlineTools(), ToolguardRuntime(manifest, airline_guards))
+
+    assert isinstance(proxy.tools, dict)
+    assert sorted(proxy.tools) == ["_tools", "cancel_reservation", "tools"]
+    assert proxy.tools["tools"](reservation_id="Q69X3R") == "tools Q69X3R"
+    assert proxy._tools(reservation_id="Q69X3R") == "_tools Q69X3R"
+    assert proxy.cancel_reservation(reservation_id="Q69X3R") == "cancelled Q69X3R"
+    assert proxy.region == "us"
@@ -0,0 +1,42 @@
+import pytest
+
+from toolguard.data_types import ItemGuardsExecution, PolicyViolationException, PolicyViolationsException, item_guards_execution, run_item_guards
+
+def violation(message: str):
+    def item_guard():
+        raise PolicyViolationException(message)
+    return item_guard
+
+def error():
+    raise KeyError("lookup failed")
+
+def passed():
+    pass
+
+def run(mode: ItemGuardsExecution, item_guards: list):
+    token = item_guards_execution.set(mode)
+    try:
+        run_item_guards(item_guards)
+    finally:
+        item_guards_execution.reset(token)
+
+@pytest.mark.parametrize("mode", list(ItemGuardsExecution))
+def test_first_failing_item_is_an_error(mode):
+    with pytest.raises(KeyError):
+        run(mode, [passed, error, violation("a")])
+
+@pytest.mark.parametrize("mode", list(ItemGuardsExecution))
+def test_violation_before_an_error(mode):
+    with pytest.raises(PolicyViolationException) as ex_info:
+        run(mode, [violation("a"), error, passed])
+    assert ex_info.value.message == "a"
+
+def test_concurrent_all_aggregates_violations_around_an_error():
+    with pytest.raises(PolicyViolationsException) as ex_info:
+        run(ItemGuardsExecution.concurrent_all, [passed, violation("a"), error, violation("b")])
+    assert [v.message for v in ex_info.value.violations] == ["a", "b"]
+
+def test_concurrent_first_reports_the_first_violation_in_items_order():
+    with pytest.raises(PolicyViolationException) as ex_info:
+        run(ItemGuardsExecution.concurrent_first, [passed, violation("a"), error, violation("b")])
+    assert ex_info.value.message == "a"
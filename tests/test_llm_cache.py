@@ -0,0 +1,66 @@
+import asyncio
+from typing import Dict, List
+
+import pytest
+
+from toolguard.llm.cache import CachedLLM, LLMCache, LLMCacheMissError, LLMCacheMode
+from toolguard.llm.tg_llm import TG_LLM
+
+MESSAGES = [{"role": "user", "content": "review the policy"}]
+
+class CountingLLM(TG_LLM):
+    """Answers with the number of calls so far"""
+    model_name = "counting"
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def chat_json(self, messages: List[Dict]) -> Dict:
+        self.calls += 1
+        return {"review": self.calls}
+
+    async def generate(self, messages: List[Dict])->str:
+        self.calls += 1
+        return f"review {self.calls}"
+
+def reviews(llm: TG_LLM, n: int = 2)->List[Dict]:
+    async def main():
+        return [await llm.chat_json(MESSAGES) for _ in range(n)]
+    return asyncio.run(main())
+
+def test_repeated_requests_get_their_distinct_responses(tmp_path):
+    llm = CountingLLM()
+    cache = LLMCache(str(tmp_path / "cache.db"))
+    assert reviews(CachedLLM(llm, cache)) == [{"review": 1}, {"review": 2}]
+
+    cache.new_run()
+    assert reviews(CachedLLM(llm, cache)) == [{"review": 1}, {"review": 2}]
+    assert llm.calls == 2
+    assert (cache.hits, cache.misses) == (2, 2)
+
+def test_second_run_in_the_same_process_replays(tmp_path):
+    path = str(tmp_path / "cache.db")
+    reviews(CachedLLM(CountingLLM(), LLMCache(path)))
+
+    replay = LLMCache(path, LLMCacheMode.replay)
+    llm = CountingLLM()
+    for _ in range(2): # eg: a notebook running step1 twice
+        replay.new_run()
+        assert reviews(CachedLLM(llm, replay)) == [{"review": 1}, {"review": 2}]
+    assert llm.calls == 0
+
+def test_replay_miss_is_an_error(tmp_path):
+    path = str(tmp_path / "cache.db")
+    reviews(CachedLLM(CountingLLM(), LLMCache(path)), n=1)
+
+    llm = CountingLLM()
+    with pytest.raises(LLMCacheMissError):
+        reviews(CachedLLM(llm, LLMCache(path, LLMCacheMode.replay)), n=2)
+    assert llm.calls == 0
+
+def test_replay_does_not_write(tmp_path):
+    path = str(tmp_path / "cache.db")
+    reviews(CachedLLM(CountingLLM(), LLMCache(path)), n=1)
+    replay = LLMCache(path, LLMCacheMode.replay)
+    replay.put("other", {"review": 0})
+    assert replay.get("other") is None
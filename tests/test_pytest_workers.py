@@ -0,0 +1,39 @@
+import os
+
+import toolguard.utils.pytest as tg_pytest
+
+HANGING_TEST = """
+import time
+
+def test_hangs():
+    while True:
+        time.sleep(1)
+"""
+
+PASSING_TEST = """
+def test_passes():
+    assert True
+"""
+
+def write(folder: str, file_name: str, content: str)->str:
+    with open(os.path.join(folder, file_name), "w") as f:
+        f.write(content)
+    return file_name
+
+def test_hanging_run_is_killed_and_failed(tmp_path):
+    folder = str(tmp_path)
+    hanging = write(folder, "test_hanging.py", HANGING_TEST)
+    passing = write(folder, "test_passing.py", PASSING_TEST)
+    with tg_pytest.PytestWorkers(folder, timeout=1.0) as workers:
+        report = workers.run(hanging, "hanging.json")
+        assert not report.all_tests_collected_successfully()
+        assert any(["did not complete within 1.0s" in error for error in report.list_errors()])
+        # the zygote keeps serving
+        assert workers.run(passing).all_tests_passed()
+
+def test_hanging_cli_run_is_killed_and_failed(tmp_path):
+    folder = str(tmp_path)
+    hanging = write(folder, "test_hanging.py", HANGING_TEST)
+    report = tg_pytest.run_subprocess(folder, hanging, "hanging.json", timeout=2.0)
+    assert any(["did not complete within 2.0s" in error for error in report.list_errors()])
+    assert tg_pytest.read_test_report(os.path.join(folder, "hanging.json")).list_errors() == report.list_errors()
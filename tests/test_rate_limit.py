@@ -0,0 +1,60 @@
+import asyncio
+import email.utils
+import time
+
+import pytest
+
+from toolguard.llm.rate_limit import TokenBucket, backoff_delay, retry_after
+
+class RateLimitError(Exception):
+    def __init__(self, headers: dict) -> None:
+        super().__init__("rate limited")
+        self.headers = headers
+
+def acquire_times(bucket: TokenBucket, n: int)->list:
+    async def main():
+        start = time.monotonic()
+        times = []
+        for _ in range(n):
+            await bucket.acquire()
+            times.append(time.monotonic() - start)
+        return times
+    return asyncio.run(main())
+
+def test_acquire_is_limited_to_the_rate():
+    bucket = TokenBucket(max_rate=20, capacity=2)
+    times = acquire_times(bucket, 6)
+    assert times[1] < 0.02 # the burst capacity
+    assert times[-1] == pytest.approx(4 / 20, abs=0.05)
+
+def test_rate_limited_pauses_and_halves_the_rate():
+    bucket = TokenBucket(max_rate=20, capacity=1, min_rate=4)
+    bucket.rate_limited(0.2)
+    assert bucket.rate == 10
+    assert acquire_times(bucket, 1)[0] >= 0.19
+
+    for _ in range(5):
+        bucket.rate_limited(0)
+    assert bucket.rate == 4
+
+def test_succeeded_restores_the_rate():
+    bucket = TokenBucket(max_rate=20)
+    bucket.rate_limited(0)
+    bucket.succeeded()
+    assert bucket.rate == 11
+    for _ in range(20):
+        bucket.succeeded()
+    assert bucket.rate == 20
+
+def test_retry_after_headers():
+    assert retry_after(RateLimitError({"Retry-After": "3"})) == 3
+    assert retry_after(RateLimitError({"retry-after-ms": "1500", "retry-after": "3"})) == 1.5
+    date = email.utils.formatdate(time.time() + 30, usegmt=True)
+    assert retry_after(RateLimitError({"Retry-After": date})) == pytest.approx(30, abs=2)
+    assert retry_after(RateLimitError({"Retry-After": "soon"})) is None
+    assert retry_after(RateLimitError({})) is None
+    assert retry_after(ValueError()) is None
+
+def test_backoff_delay_is_bounded():
+    for retries in range(10):
+        assert 0 <= backoff_delay(retries, 2, max_delay=5) <= min(5, 2 ** retries)
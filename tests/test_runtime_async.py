@@ -0,0 +1,47 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Type
+
+import pytest
+
+from toolguard.runtime import IAsyncToolInvoker, is_policy_violation, load_toolguards
+
+from airline_fixture import BLOCKED_USER, SAMPLE_CALLS, UsersInvoker
+
+class ToThreadInvoker(IAsyncToolInvoker):
+    """Async tools that run the sync ones with `asyncio.to_thread`, on the loop default executor."""
+    async def invoke(self, toolname: str, arguments: Dict[str, Any], model: Type):
+        return await asyncio.to_thread(UsersInvoker().invoke, toolname, arguments, model)
+
+class SlowInvoker(IAsyncToolInvoker):
+    async def invoke(self, toolname: str, arguments: Dict[str, Any], model: Type):
+        await asyncio.sleep(10)
+
+def book(user_id: str)->dict:
+    return {**SAMPLE_CALLS["book_reservation"], "user_id": user_id}
+
+async def check(runtime, args: dict, invoker: IAsyncToolInvoker)->bool:
+    """Whether the call is a policy violation"""
+    try:
+        await runtime.check_toolcall_async("book_reservation", args, invoker)
+        return False
+    except Exception as ex:
+        if is_policy_violation(ex):
+            return True
+        raise
+
+def test_more_concurrent_checks_than_workers(airline_guards):
+    n_calls = 64
+    with load_toolguards(airline_guards, async_max_workers=4) as runtime:
+        async def main():
+            # a small default executor, shared with the tools, must not be starved by the waiting guards
+            asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=2))
+            calls = [book(BLOCKED_USER if i % 2 else "mia_li_3668") for i in range(n_calls)]
+            return await asyncio.wait_for(asyncio.gather(*[check(runtime, args, ToThreadInvoker()) for args in calls]), 20)
+        violations = asyncio.run(main())
+    assert violations == [bool(i % 2) for i in range(n_calls)]
+
+def test_tool_timeout(airline_guards):
+    with load_toolguards(airline_guards, async_tool_timeout=0.1) as runtime:
+        with pytest.raises(TimeoutError):
+            asyncio.run(asyncio.wait_for(check(runtime, book("mia_li_3668"), SlowInvoker()), 5))
@@ -0,0 +1,54 @@
+import threading
+import time
+from typing import Any, Dict, Type
+
+import pytest
+
+from toolguard.data_types import GuardTimeoutException
+from toolguard.runtime import BudgetExceededPolicy, HistogramMetricsSink, IToolInvoker, load_toolguards
+
+from airline_fixture import SAMPLE_CALLS, UsersInvoker
+
+class BlockingInvoker(IToolInvoker):
+    """Tools that wait until released"""
+    def __init__(self) -> None:
+        self.released = threading.Event()
+
+    def invoke(self, toolname: str, arguments: Dict[str, Any], model: Type):
+        self.released.wait()
+        return UsersInvoker().invoke(toolname, arguments, model)
+
+def wait_for(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+def test_abandoned_checks_are_capped(airline_guards):
+    metrics = HistogramMetricsSink()
+    runtime = load_toolguards(airline_guards, metrics=metrics, time_budget=0.05, 
+        budget_exceeded=BudgetExceededPolicy.fail_open, max_abandoned_checks=3)
+    invoker = BlockingInvoker()
+    args = SAMPLE_CALLS["book_reservation"]
+    for _ in range(3): # allowed, and left running
+        runtime.check_toolcall("book_reservation", args, invoker)
+    assert metrics.abandoned_checks == 3
+    threads = threading.active_count()
+
+    start = time.perf_counter()
+    with pytest.raises(GuardTimeoutException):
+        runtime.check_toolcall("book_reservation", args, invoker)
+    assert time.perf_counter() - start < 0.05 # rejected without waiting for the budget
+    assert threading.active_count() == threads
+    assert metrics.budget_exceeded()["book_reservation"] == 4
+
+    invoker.released.set()
+    wait_for(lambda: metrics.abandoned_checks == 0)
+    runtime.check_toolcall("book_reservation", args, invoker)
+
+def test_check_within_budget(airline_guards):
+    metrics = HistogramMetricsSink()
+    runtime = load_toolguards(airline_guards, metrics=metrics, time_budget=5.0)
+    runtime.check_toolcall("book_reservation", SAMPLE_CALLS["book_reservation"], UsersInvoker())
+    assert metrics.abandoned_checks == 0
+    assert metrics.budget_exceeded() == {}
@@ -0,0 +1,107 @@
+from typing import Any, Dict, List, Type
+
+from toolguard.runtime import CachingToolInvoker, IToolInvoker, ToolFunctionsInvoker, read_only_tool
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self)->float:
+        return self.now
+
+class CountingInvoker(IToolInvoker):
+    """Answers with the tool name, arguments and call number"""
+    def __init__(self) -> None:
+        self.calls: List[str] = []
+
+    def invoke(self, toolname: str, arguments: Dict[str, Any], model: Type)->Any:
+        self.calls.append(toolname)
+        return (toolname, arguments, len(self.calls))
+
+def test_results_are_reused_until_they_expire():
+    clock = FakeClock()
+    delegate = CountingInvoker()
+    cache = CachingToolInvoker(delegate, {"get_user_details"}, ttl=10, clock=clock)
+
+    first = cache.invoke("get_user_details", {"user_id": "mia_li_3668"}, dict)
+    clock.now = 9
+    assert cache.invoke("get_user_details", {"user_id": "mia_li_3668"}, dict) == first
+    clock.now = 10
+    assert cache.invoke("get_user_details", {"user_id": "mia_li_3668"}, dict) != first
+
+    stats = cache.stats()["get_user_details"]
+    assert (stats.hits, stats.misses, stats.expirations) == (1, 2, 1)
+    assert delegate.calls == ["get_user_details"] * 2
+
+def test_ttl_per_tool():
+    clock = FakeClock()
+    delegate = CountingInvoker()
+    cache = CachingToolInvoker(delegate, {"get_user_details", "get_reservation_details"}, ttl=10,
+        tool_ttls={"get_reservation_details": 1}, clock=clock)
+    cache.invoke("get_user_details", {"user_id": "mia_li_3668"}, dict)
+    cache.invoke("get_reservation_details", {"reservation_id": "Q69X3R"}, dict)
+
+    clock.now = 5
+    cache.invoke("get_user_details", {"user_id": "mia_li_3668"}, dict)
+    cache.invoke("get_reservation_details", {"reservation_id": "Q69X3R"}, dict)
+    assert delegate.calls == ["get_user_details", "get_reservation_details", "get_reservation_details"]
+
+def test_least_recently_used_is_evicted():
+    delegate = CountingInvoker()
+    cache = CachingToolInvoker(delegate, {"get_reservation_details"}, max_entries=2)
+    for reservation_id in ["A", "B", "A", "C"]: # "B" is the least recently used when "C" is added
+        cache.invoke("get_reservation_details", {"reservation_id": reservation_id}, dict)
+    assert len(delegate.calls) == 3
+
+    cache.invoke("get_reservation_details", {"reservation_id": "A"}, dict)
+    assert len(delegate.calls) == 3
+    cache.invoke("get_reservation_details", {"reservation_id": "B"}, dict)
+    assert len(delegate.calls) == 4
+    assert cache.stats()["get_reservation_details"].evictions == 2
+
+def test_arguments_order_does_not_matter():
+    delegate = CountingInvoker()
+    cache = CachingToolInvoker(delegate, {"search_flights"})
+    cache.invoke("search_flights", {"origin": "JFK", "destination": "SEA"}, list)
+    cache.invoke("search_flights", {"destination": "SEA", "origin": "JFK"}, list)
+    assert len(delegate.calls) == 1
+    assert cache.hit_rate == 0.5
+
+def test_other_tools_are_not_cached():
+    delegate = CountingInvoker()
+    cache = CachingToolInvoker(delegate, {"get_user_details"})
+    for _ in range(2):
+        cache.invoke("cancel_reservation", {"reservation_id": "Q69X3R"}, dict)
+    assert delegate.calls == ["cancel_reservation"] * 2
+    assert "cancel_reservation" not in cache.stats()
+
+def test_decorated_tools_are_read_only():
+    calls = []
+    @read_only_tool
+    def get_user_details(user_id: str):
+        calls.append(user_id)
+        return {"user_id": user_id}
+    def cancel_reservation(reservation_id: str):
+        calls.append(reservation_id)
+
+    cache = CachingToolInvoker(ToolFunctionsInvoker([get_user_details, cancel_reservation]))
+    for _ in range(2):
+        cache.invoke("get_user_details", {"user_id": "mia_li_3668"}, dict)
+        cache.invoke("cancel_reservation", {"reservation_id": "Q69X3R"}, dict)
+    assert calls == ["mia_li_3668", "Q69X3R", "Q69X3R"]
+
+def test_invalidate():
+    delegate = CountingInvoker()
+    cache = CachingToolInvoker(delegate, {"get_user_details", "get_reservation_details"})
+    def lookup_both():
+        cache.invoke("get_user_details", {"user_id": "mia_li_3668"}, dict)
+        cache.invoke("get_reservation_details", {"reservation_id": "Q69X3R"}, dict)
+
+    lookup_both()
+    cache.invalidate("get_reservation_details")
+    lookup_both()
+    assert delegate.calls == ["get_user_details", "get_reservation_details", "get_reservation_details"]
+
+    cache.invalidate()
+    lookup_both()
+    assert len(delegate.calls) == 5